@@ -19,9 +19,11 @@ This eliminates manual recording - fully autonomous from storyline to footage.
 import os
 import sys
 import re
+import mmap
 from pathlib import Path
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Iterable, Iterator, Union
+from dataclasses import dataclass, field
+from enum import Enum
 import json
 from datetime import datetime
 import time
@@ -30,9 +32,223 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 import threading
+import queue
+import functools
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
+import base64
+import tempfile
+import socket
+try:
+    import fcntl  # POSIX only; elsewhere only Chrome's own lock is checked
+except ImportError:
+    fcntl = None
+
+# Add parent to path for config_loader
+sys.path.insert(0, str(Path(__file__).parent))
+from config_loader import load_config, CACHE_DIR
+
+# Storyline patterns, compiled once at import. They run over the raw bytes of the
+# memory-mapped storyline; only captured groups are decoded.
+# Product_Specs style: ### Scene 1: Title (0:00-0:30)
+_SPECS_RE = re.compile(rb'### Scene (\d+): (.+?) \((\d+):(\d+)-(\d+):(\d+)\)')
+# Storyline.md style: ## Scene 1: Title\n**Duration**: 30s
+_STORYLINE_RE = re.compile(rb'## Scene (\d+): (.+?)\n\*\*Duration\*\*: (\d+)s')
+_BROWSER_ACTIONS_RE = re.compile(rb'### Browser Actions\n(.*?)(?=\n###|\n---|\Z)', re.DOTALL)
+_ACTIONS_RE = re.compile(rb'\*\*Actions:\*\*\n(.*?)(?=\n###|\n\*\*|\n---|\Z)', re.DOTALL)
+_BULLET_RE = re.compile(rb'^- (.+)$', re.MULTILINE)
+_QUOTED_RE = re.compile(r"['\"](.*?)['\"]")
+
+# Frame capture settings: JPEG frames piped into ffmpeg at a fixed rate
+CAPTURE_FPS = 5
+_SCREENSHOT_PARAMS = {"format": "jpeg", "quality": 70}
+
+# Warm Chrome profiles (disk cache) reused across runs, one per concurrent recorder
+CHROME_PROFILE_DIR = CACHE_DIR / "chrome_profile"
+
+_VAAPI_DEVICE = "/dev/dri/renderD128"
+_EVEN_PAD = "pad=ceil(iw/2)*2:ceil(ih/2)*2"
+
+# Evaluates a list of XPath strategies in-page and returns [element, xpath] for the
+# first visible match (or null), optionally highlighting/scrolling it in the same call.
+# A previously found element (arguments[3]) is reused if still attached and visible.
+# arguments: [xpaths, border_style, scroll_into_view, cached_element]
+_FIND_VISIBLE_JS = """
+const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+const cached = arguments[3];
+if (cached && cached.isConnected && visible(cached)) {
+    if (arguments[2]) cached.scrollIntoView({block: 'center'});
+    if (arguments[1]) cached.style.border = arguments[1];
+    return [cached, 'cache'];
+}
+for (const xpath of arguments[0]) {
+    let found;
+    try {
+        found = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+        continue;
+    }
+    for (let i = 0; i < found.snapshotLength; i++) {
+        const el = found.snapshotItem(i);
+        if (el.nodeType === Node.ELEMENT_NODE && visible(el)) {
+            if (arguments[2]) el.scrollIntoView({block: 'center'});
+            if (arguments[1]) el.style.border = arguments[1];
+            return [el, xpath];
+        }
+    }
+}
+return null;
+"""
+
+
+def _xpath_literal(text: str) -> str:
+    """Quote text for an XPath 1.0 expression (XPath has no escape sequences)"""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat('" + "', \"'\", '".join(text.split("'")) + "')"
+
+
+@dataclass(frozen=True)
+class EncoderProfile:
+    """ffmpeg arguments for one output encoder"""
+    suffix: str
+    input_args: tuple
+    output_args: tuple
+    segmentable: bool = True  # False when the encoder emits the whole clip as one packet
+
+
+ENCODERS = {
+    "libx264": EncoderProfile(
+        ".mp4", (),
+        (
+            "-c:v", "libx264", "-pix_fmt", "yuv420p", "-vf", _EVEN_PAD,
+            # 5 fps screen captures gain nothing from slower presets
+            "-preset", "ultrafast", "-tune", "stillimage", "-threads", "0",
+            "-g", str(CAPTURE_FPS)
+        )
+    ),
+    "h264_vaapi": EncoderProfile(
+        ".mp4", ("-vaapi_device", _VAAPI_DEVICE),
+        ("-vf", f"{_EVEN_PAD},format=nv12,hwupload", "-c:v", "h264_vaapi")
+    ),
+    "h264_nvenc": EncoderProfile(
+        ".mp4", (),
+        ("-c:v", "h264_nvenc", "-pix_fmt", "yuv420p", "-vf", _EVEN_PAD)
+    ),
+    "libwebp_anim": EncoderProfile(
+        ".webp", (),
+        ("-c:v", "libwebp_anim", "-loop", "0", "-lossless", "0", "-q:v", "60"),
+        segmentable=False
+    ),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _available_encoders() -> str:
+    """Raw `ffmpeg -encoders` listing, queried once per process"""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True, check=True
+        )
+        return result.stdout
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def resolve_encoder(name: Optional[str]) -> str:
+    """Resolve an encoder name from config/CLI, picking hardware encoders for 'auto'"""
+    if name and name != "auto":
+        if name not in ENCODERS:
+            raise ValueError(f"Unknown encoder '{name}'. Choose from: auto, {', '.join(ENCODERS)}")
+        return name
+    
+    available = _available_encoders()
+    if shutil.which("nvidia-smi") and " h264_nvenc " in available:
+        return "h264_nvenc"
+    if os.path.exists(_VAAPI_DEVICE) and " h264_vaapi " in available:
+        return "h264_vaapi"
+    return "libx264"
+
+
+class ActionKind(Enum):
+    """Browser action verbs understood by BrowserRecorder.execute_action"""
+    WAIT = "wait"
+    CLICK = "click"
+    TYPE = "type"
+    NAVIGATE = "navigate"
+    UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True)
+class ParsedAction:
+    """A storyline action tokenized once into its verb and arguments"""
+    kind: ActionKind
+    raw: str
+    target: str = ""      # click text, input name or URL
+    text: str = ""        # text to type
+    seconds: int = 2      # wait duration
+
+
+def _parse_wait(action: str, rest: str) -> ParsedAction:
+    # "Wait X seconds"
+    seconds = next((int(part) for part in rest.split() if part.isdigit()), 2)
+    return ParsedAction(ActionKind.WAIT, action, seconds=seconds)
+
+
+def _parse_click(action: str, rest: str) -> ParsedAction:
+    # "Click [Text]..." - prefer quoted text, otherwise the whole remainder
+    target = rest.strip()
+    if "'" in target:
+        target = target.split("'")[1]
+    elif '"' in target:
+        target = target.split('"')[1]
+    return ParsedAction(ActionKind.CLICK, action, target=target)
+
+
+def _parse_type(action: str, rest: str) -> ParsedAction:
+    # "Type 'text' in 'Element'"
+    matches = _QUOTED_RE.findall(rest)
+    if not matches:
+        return ParsedAction(ActionKind.UNKNOWN, action)
+    target = matches[1] if len(matches) >= 2 else ""
+    return ParsedAction(ActionKind.TYPE, action, target=target, text=matches[0])
+
+
+def _parse_navigate(action: str, rest: str) -> ParsedAction:
+    # "Navigate to [URL]"
+    for token in rest.split():
+        # Drop surrounding quotes/brackets and trailing sentence punctuation
+        url = token.strip('\'"<>()[]').rstrip('.,;')
+        if url.startswith(('http://', 'https://')):
+            return ParsedAction(ActionKind.NAVIGATE, action, target=url)
+    return ParsedAction(ActionKind.UNKNOWN, action)
+
+
+_ACTION_PARSERS = {
+    "wait": _parse_wait,
+    "click": _parse_click,
+    "type": _parse_type,
+    "navigate": _parse_navigate,
+}
+
+
+def parse_action(action: str) -> ParsedAction:
+    """Tokenize a free-form storyline action like "Click 'Sign Up'" """
+    action = action.strip()
+    verb, _, rest = action.partition(' ')
+    parse = _ACTION_PARSERS.get(verb.lower().rstrip(':'))
+    if parse is None:
+        return ParsedAction(ActionKind.UNKNOWN, action)
+    return parse(action, rest)
+
 
 @dataclass
 class SceneRecording:
@@ -43,8 +259,14 @@ class SceneRecording:
     browser_actions: List[str]
     has_actions: bool
     recording_path: Optional[Path] = None
-    status: str = "pending"  # pending, recording, success, failed, skipped
+    status: str = "pending"  # pending, recording, captured, success, failed, skipped
     error_message: Optional[str] = None
+    frame_codec: Optional[str] = None  # ffmpeg input codec of captured frames
+    frames: List[bytes] = field(default_factory=list, repr=False)
+    parsed_actions: List[ParsedAction] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.parsed_actions = [parse_action(a) for a in self.browser_actions]
 
 
 class StorylineParser:
@@ -52,60 +274,68 @@ class StorylineParser:
     
     def __init__(self, storyline_path: Path):
         self.storyline_path = storyline_path
-        self.content = storyline_path.read_text(encoding='utf-8')
     
     def parse_scenes(self) -> List[SceneRecording]:
         """Extract all scenes with browser actions from storyline"""
-        scenes = []
-        
-        # Find all scene blocks
-        # Support both Storyline.md (## Scene 1) and Product_Specs.json (### Scene 1)
-        # Specs format: ### Scene 1: Title (0:00-0:30)
-        
-        # Regex for Product_Specs.json style
-        specs_pattern = r'### Scene (\d+): (.+?) \((\d+):(\d+)-(\d+):(\d+)\)'
-        specs_matches = list(re.finditer(specs_pattern, self.content))
-        
-        if specs_matches:
-             for match in specs_matches:
-                scene_num = int(match.group(1))
-                title = match.group(2).strip()
-                # Calculate duration from timestamps
-                start_min, start_sec = int(match.group(3)), int(match.group(4))
-                end_min, end_sec = int(match.group(5)), int(match.group(6))
-                start_seconds = start_min * 60 + start_sec
-                end_seconds = end_min * 60 + end_sec
-                duration = end_seconds - start_seconds
-                
-                # Extract block
-                scene_start = match.end()
-                next_scene = re.search(r'\n### Scene \d+:', self.content[scene_start:])
-                scene_end = scene_start + next_scene.start() if next_scene else len(self.content)
-                scene_block = self.content[scene_start:scene_end]
-                
-                self._parse_block(scenes, scene_num, title, duration, scene_block)
-                
-        else:
-            # Fallback to Storyline.md style
-            scene_pattern = r'## Scene (\d+): (.+?)\n\*\*Duration\*\*: (\d+)s'
-            scene_matches = re.finditer(scene_pattern, self.content)
-            
-            for match in scene_matches:
-                scene_num = int(match.group(1))
-                title = match.group(2).strip()
-                duration = int(match.group(3))
+        return list(self.iter_scenes())
+    
+    def iter_scenes(self) -> Iterator[SceneRecording]:
+        """Yield scenes one at a time as they are found in the storyline"""
+        for scene_num, title, duration, scene_block in self._read_blocks():
+            yield self._parse_block(scene_num, title, duration, scene_block)
+    
+    def _read_blocks(self) -> list:
+        """
+        (scene number, title, duration, block bytes) for every scene
+        
+        The file is mapped instead of copied into a str and the regexes scan the
+        mapping directly; headings and blocks are copied out so the mapping can be
+        closed before any scene is parsed.
+        """
+        with open(self.storyline_path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                return []  # mmap rejects empty files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                # Find all scene blocks
+                # Support both Storyline.md (## Scene 1) and Product_Specs.json (### Scene 1)
+                # Specs format: ### Scene 1: Title (0:00-0:30)
                 
-                # Extract block
-                scene_start = match.end()
-                next_scene = re.search(r'\n## Scene \d+:', self.content[scene_start:])
-                scene_end = scene_start + next_scene.start() if next_scene else len(self.content)
-                scene_block = self.content[scene_start:scene_end]
+                # Regex for Product_Specs.json style
+                if _SPECS_RE.search(content):
+                    blocks = []
+                    for match, scene_block in self._iter_blocks(_SPECS_RE, content):
+                        # Calculate duration from timestamps
+                        start_min, start_sec, end_min, end_sec = map(int, match.group(3, 4, 5, 6))
+                        duration = (end_min - start_min) * 60 + (end_sec - start_sec)
+                        blocks.append((int(match.group(1)), match.group(2).decode('utf-8').strip(),
+                                       duration, scene_block))
+                    return blocks
                 
-                self._parse_block(scenes, scene_num, title, duration, scene_block)
+                # Fallback to Storyline.md style
+                return [
+                    (int(match.group(1)), match.group(2).decode('utf-8').strip(),
+                     int(match.group(3)), scene_block)
+                    for match, scene_block in self._iter_blocks(_STORYLINE_RE, content)
+                ]
+    
+    @staticmethod
+    def _iter_blocks(heading_re, content) -> Iterator[tuple]:
+        """
+        Yield (heading match, block) pairs in a single pass
         
-        return scenes
+        Each block runs from the end of one heading to the start of the next,
+        so the document is scanned once instead of re-searching the tail for
+        every scene. Blocks are bytes copies, not views of `content`.
+        """
+        previous = None
+        for match in heading_re.finditer(content):
+            if previous is not None:
+                yield previous, content[previous.end():match.start()]
+            previous = match
+        if previous is not None:
+            yield previous, content[previous.end():]
 
-    def _parse_block(self, scenes, scene_num, title, duration, scene_block):
+    def _parse_block(self, scene_num, title, duration, scene_block) -> SceneRecording:
         """Helper to parse actions from a scene block"""
             
         # Parse browser actions
@@ -113,52 +343,390 @@ class StorylineParser:
         actions_matches = []
         
         # Check for ### Browser Actions section
-        actions_section = re.search(
-            r'### Browser Actions\n(.*?)(?=\n###|\n---|\Z)',
-            scene_block,
-            re.DOTALL
-        )
+        actions_section = _BROWSER_ACTIONS_RE.search(scene_block)
         if actions_section:
-            actions_matches = re.findall(r'^- (.+)$', actions_section.group(1), re.MULTILINE)
+            actions_matches = _BULLET_RE.findall(actions_section.group(1))
         else:
             # Check for **Actions:** section
-            actions_section = re.search(
-                r'\*\*Actions:\*\*\n(.*?)(?=\n###|\n\*\*|\n---|\Z)',
-                scene_block,
-                re.DOTALL
-            )
+            actions_section = _ACTIONS_RE.search(scene_block)
             if actions_section:
-                actions_matches = re.findall(r'^- (.+)$', actions_section.group(1), re.MULTILINE)
+                actions_matches = _BULLET_RE.findall(actions_section.group(1))
         
-        browser_actions = [a.strip() for a in actions_matches if a.strip()]
+        browser_actions = [a.decode('utf-8').strip() for a in actions_matches if a.strip()]
         has_actions = bool(browser_actions)
         
-        scene = SceneRecording(
+        return SceneRecording(
             scene_number=scene_num,
             title=title,
             duration_seconds=duration,
             browser_actions=browser_actions,
             has_actions=has_actions
         )
-        scenes.append(scene)
+
+
+class FrameStream:
+    """
+    Long-lived ffmpeg process fed from a queue, shared by every scene of one recorder
+    
+    Capture threads push frames as they are taken and a writer thread drains
+    them into ffmpeg, so encoding overlaps recording. Scene boundaries are not
+    known up front, so each scene is padded to whole seconds and a keyframe is
+    forced every second; split() then cuts the stream at the scene starts with
+    a single stream-copy pass.
+    """
+    
+    def __init__(self, codec: str, profile: EncoderProfile, work_dir: Path):
+        self.profile = profile
+        self.path = work_dir / "stream.mkv"
+        self.work_dir = work_dir
+        self.frames_queued = 0
+        self.scenes: List[tuple] = []  # (scene, first frame, end frame)
+        self._last_frame: Optional[bytes] = None
+        self._queue: queue.Queue = queue.Queue()
+        self._stderr = tempfile.TemporaryFile()
+        
+        cmd = [
+            "ffmpeg",
+            "-y", # Overwrite
+            "-hide_banner", "-loglevel", "error",
+            *profile.input_args,
+            "-f", "image2pipe",
+            "-framerate", str(CAPTURE_FPS),
+            "-c:v", codec,
+            "-i", "-",
+            *profile.output_args,
+            "-force_key_frames", f"expr:eq(mod(n,{CAPTURE_FPS}),0)",
+            "-f", "matroska",
+            str(self.path)
+        ]
+        self._process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr
+        )
+        self._writer = threading.Thread(target=self._drain, daemon=True)
+        self._writer.start()
+    
+    def _drain(self):
+        """Writer thread: move queued frames into ffmpeg's stdin"""
+        broken = False
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            if broken:
+                continue  # keep draining so producers never block
+            try:
+                self._process.stdin.write(frame)
+            except BrokenPipeError:
+                broken = True
+    
+    def put(self, frame: bytes):
+        """Queue one captured frame"""
+        self._queue.put(frame)
+        self._last_frame = frame
+        self.frames_queued += 1
+    
+    def end_scene(self, scene: SceneRecording, start: int) -> int:
+        """Pad the scene to whole seconds, record its range and return its frame count"""
+        if self.frames_queued == start:
+            return 0
+        while (self.frames_queued - start) % CAPTURE_FPS:
+            self.put(self._last_frame)
+        self.scenes.append((scene, start, self.frames_queued))
+        return self.frames_queued - start
+    
+    def _close_input(self) -> int:
+        self._queue.put(None)
+        self._writer.join()
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        return self._process.wait()
+    
+    def _error_output(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode('utf-8', errors='replace').strip()
+    
+    def split(self):
+        """Finish encoding and write every captured scene to its recording_path"""
+        returncode = self._close_input()
+        scenes = [entry for entry in self.scenes if entry[0].status == "captured"]
+        
+        if returncode == 0 and scenes:
+            # Keyframes sit on every scene start, so the cut is a pure remux
+            self._stderr.seek(0)
+            self._stderr.truncate()
+            starts = [start / CAPTURE_FPS for _, start, _ in self.scenes[1:]]
+            cmd = [
+                "ffmpeg",
+                "-y", # Overwrite
+                "-hide_banner", "-loglevel", "error",
+                "-i", str(self.path),
+                "-c", "copy",
+                "-f", "segment",
+                "-reset_timestamps", "1",
+            ]
+            if starts:
+                cmd += ["-segment_times", ",".join(f"{t:g}" for t in starts)]
+            else:
+                cmd += ["-segment_time", "86400"]
+            cmd.append(str(self.work_dir / f"segment_%03d{self.profile.suffix}"))
+            returncode = subprocess.run(
+                cmd, stdout=subprocess.DEVNULL, stderr=self._stderr
+            ).returncode
+        
+        error_output = self._error_output() if returncode != 0 else ""
+        if error_output:
+            print(f"   ❌ FFmpeg: {error_output.splitlines()[-1]}")
         
-        return scenes
+        for i, (scene, _, _) in enumerate(self.scenes):
+            if scene.status != "captured":
+                continue
+            
+            if returncode != 0:
+                print(f"   ❌ Scene {scene.scene_number}: FFmpeg encoding failed (exit code {returncode})")
+                scene.status = "failed"
+                scene.error_message = error_output or f"ffmpeg exited with code {returncode}"
+                continue
+            
+            segment = self.work_dir / f"segment_{i:03d}{self.profile.suffix}"
+            scene.recording_path = scene.recording_path.with_suffix(self.profile.suffix)
+            if not segment.exists():
+                print(f"   ❌ Scene {scene.scene_number}: missing encoded segment")
+                scene.status = "failed"
+                continue
+            segment.replace(scene.recording_path)
+            print(f"   ✅ Saved video: {scene.recording_path}")
+            scene.status = "success"
+        
+        self._stderr.close()
+    
+    def abort(self):
+        """Stop the encoder without producing output"""
+        self._queue.put(None)
+        self._writer.join()
+        self._process.kill()
+        self._process.wait()
+        self._stderr.close()
+
+
+def _chrome_lock_held(profile: Path) -> bool:
+    """Whether a live Chrome holds the profile (SingletonLock -> "<host>-<pid>")"""
+    try:
+        target = os.readlink(profile / "SingletonLock")
+    except OSError:
+        return False  # No lock (or not a symlink platform)
+    host, _, pid = target.rpartition("-")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True  # Can't check another machine's process: assume it's live
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False  # Stale lock; Chrome clears it itself
+    except PermissionError:
+        pass
+    return True
 
 
 class BrowserRecorder:
     """Executes browser actions and captures recordings"""
     
-    def __init__(self, output_dir: Path, config=None):
+    def __init__(
+        self,
+        output_dir: Path,
+        config=None,
+        driver_path: Optional[str] = None,
+        encoder: Optional[str] = None,
+        profile_dir: Optional[Path] = None
+    ):
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.config = config
+        # CLI override > Product_Specs "recording.encoder" > auto-detect
+        if encoder is None and config is not None:
+            encoder = config.recording.encoder
+        self.encoder = resolve_encoder(encoder)
+        self.driver = None
+        self._driver_path = driver_path
+        # Persistent Chrome profile so the disk cache survives scenes and runs; it lives in
+        # the shared cache dir, not the per-run recordings the compositor consumes.
+        # Concurrent recorders need distinct dirs (Chrome locks the profile); if another
+        # process holds this one, _claim_profile() falls back to a throwaway profile
+        self._profile_dir = profile_dir or CHROME_PROFILE_DIR / "default"
+        self._profile_lock = None  # flock held while we own the persistent profile
+        self._temp_profile: Optional[Path] = None
+        self._cache_warm = False
+        self._cdp_capture = None  # probed on first scene
+        self._element_cache: Dict[str, WebElement] = {}  # reset per scene
+        self._segment_dir: Optional[Path] = None  # scratch dir reused across batches
+        self._stream: Optional[FrameStream] = None  # started with the first scene
+        self._handlers = {
+            ActionKind.WAIT: self._do_wait,
+            ActionKind.CLICK: self._do_click,
+            ActionKind.TYPE: self._do_type,
+            ActionKind.NAVIGATE: self._do_navigate,
+        }
+    
+    def _get_driver(self) -> webdriver.Chrome:
+        """Lazily start a single Chrome session shared by all scenes"""
+        if self.driver is not None:
+            return self.driver
+        
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument(f"--user-data-dir={self._claim_profile().resolve()}")
+        options.add_argument("--disk-cache-size=268435456")  # 256 MB
+        
+        # Normally resolved once by main(); fall back for standalone use
+        if self._driver_path is None:
+            self._driver_path = ChromeDriverManager().install()
+        
+        service = Service(self._driver_path)
+        driver = webdriver.Chrome(service=service, options=options)
+        
+        # The capture thread takes screenshots while the action thread drives the page, and a
+        # Selenium session is not thread-safe. Every command (WebElement calls and CDP included)
+        # goes through driver.execute, so serialize there: per round trip, not per action, so
+        # a multi-second Wait action doesn't freeze the video (a get() holds it until loaded)
+        execute = driver.execute
+        lock = threading.Lock()
+        
+        def locked_execute(*args, **kwargs):
+            with lock:
+                return execute(*args, **kwargs)
+        
+        driver.execute = locked_execute
+        self.driver = driver
+        return self.driver
+    
+    def _claim_profile(self) -> Path:
+        """
+        The persistent profile if no one else is using it, else a fresh temporary one
+        
+        Another pipeline run (same worker slot) is detected by an flock held for the
+        recorder's lifetime; an orphaned Chrome by its live SingletonLock.
+        """
+        profile = self._profile_dir
+        profile.mkdir(parents=True, exist_ok=True)
+        lock_file = open(profile.with_name(f"{profile.name}.lock"), "w")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            if not _chrome_lock_held(profile):
+                self._profile_lock = lock_file
+                return profile
+        except OSError:
+            pass
+        lock_file.close()
+        
+        self._temp_profile = Path(tempfile.mkdtemp(prefix="chrome_profile_"))
+        print(f"   ⚠️  Chrome profile {profile} is in use, using a temporary one (cold cache)")
+        return self._temp_profile
+    
+    def _frame_codec(self, driver: webdriver.Chrome) -> str:
+        """Pick the frame format once: CDP JPEG if available, else in-memory PNG"""
+        if self._cdp_capture is None:
+            try:
+                driver.execute_cdp_cmd("Page.captureScreenshot", _SCREENSHOT_PARAMS)
+                self._cdp_capture = True
+            except Exception as e:
+                print(f"   ⚠️  CDP capture unavailable, using PNG screenshots: {e}")
+                self._cdp_capture = False
+        return "mjpeg" if self._cdp_capture else "png"
+    
+    def _capture_frame(self, driver: webdriver.Chrome) -> bytes:
+        """Grab the current viewport as encoded image bytes, never touching disk"""
+        if self._cdp_capture:
+            result = driver.execute_cdp_cmd("Page.captureScreenshot", _SCREENSHOT_PARAMS)
+            return base64.b64decode(result["data"])
+        return driver.get_screenshot_as_png()
+    
+    def _find_visible(
+        self,
+        driver: webdriver.Chrome,
+        cache_key: str,
+        xpaths: List[str],
+        border: str,
+        scroll: bool
+    ):
+        """Locate (or reuse) an element in one round trip; returns [element, xpath] or None"""
+        cached = self._element_cache.get(cache_key)
+        try:
+            found = driver.execute_script(_FIND_VISIBLE_JS, xpaths, border, scroll, cached)
+        except StaleElementReferenceException:
+            # Cached handle belongs to a previous document
+            self._element_cache.pop(cache_key, None)
+            found = driver.execute_script(_FIND_VISIBLE_JS, xpaths, border, scroll, None)
+        if found:
+            self._element_cache[cache_key] = found[0]
+        return found
+    
+    def _wait_ready(self, driver: webdriver.Chrome, timeout: float = 5.0):
+        """Poll document.readyState every 50ms instead of sleeping a fixed interval"""
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.05).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except TimeoutException:
+            print(f"      ⚠️  Page not ready after {timeout}s, continuing")
+    
+    def close(self):
+        """Shut down the shared Chrome session"""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                print(f"   ⚠️  Driver shutdown warning: {e}")
+            self.driver = None
+        if self._profile_lock is not None:
+            self._profile_lock.close()  # releases the flock
+            self._profile_lock = None
+        if self._temp_profile is not None:
+            shutil.rmtree(self._temp_profile, ignore_errors=True)
+            self._temp_profile = None
+        if self._stream is not None:
+            self._stream.abort()
+            self._stream = None
+        if self._segment_dir is not None:
+            shutil.rmtree(self._segment_dir, ignore_errors=True)
+            self._segment_dir = None
+    
+    def _frame_stream(self, codec: str) -> Optional[FrameStream]:
+        """The recorder's persistent encoder, or None when frames must be encoded per clip"""
+        profile = ENCODERS[self.encoder]
+        if not profile.segmentable:
+            return None
+        if self._stream is None:
+            self._stream = FrameStream(codec, profile, self._scratch_dir())
+        return self._stream
+    
+    def flush(self):
+        """Finish the persistent encoder and save every scene it carried"""
+        if self._stream is not None:
+            print(f"\n🎞️  Encoder: {self.encoder} ({len(self._stream.scenes)} scene(s) streamed)")
+            self._stream.split()
+            self._stream = None
+    
+    def _scratch_dir(self) -> Path:
+        """Create the segment scratch dir once and reuse it for every batch"""
+        if self._segment_dir is None:
+            self._segment_dir = Path(tempfile.mkdtemp(prefix="segments_", dir=self.output_dir))
+        return self._segment_dir
     
-    def convert_actions_to_instructions(self, actions: List[str], scene_title: str, duration: int) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def convert_actions_to_instructions(actions: tuple, scene_title: str, duration: int) -> str:
         """
         Convert storyline actions into detailed browser automation instructions
         
+        Memoized on (actions, title, duration), so repeated scenes reuse the
+        same prompt string.
+        
         Args:
-            actions: List of browser actions from storyline
+            actions: Tuple of browser actions from storyline
             scene_title: Scene title for context
             duration: Expected scene duration
             
@@ -176,10 +744,9 @@ class BrowserRecorder:
 **Actions to Perform**:
 """
         
-        for i, action in enumerate(actions, 1):
-            instructions += f"{i}. {action}\n"
+        steps = "".join(f"{i}. {action}\n" for i, action in enumerate(actions, 1))
         
-        instructions += f"""
+        footer = f"""
 **Important Guidelines**:
 - Wait 2-3 seconds after each action for page/UI to respond
 - If an element is not found, take a screenshot and note it
@@ -194,7 +761,7 @@ When all actions are complete OR {duration} seconds have elapsed, stop recording
 - Any errors encountered
 """
         
-        return instructions
+        return instructions + steps + footer
     
     def record_scene(self, scene: SceneRecording) -> bool:
         """
@@ -217,7 +784,7 @@ When all actions are complete OR {duration} seconds have elapsed, stop recording
         
         # Generate browser automation instructions
         instructions = self.convert_actions_to_instructions(
-            scene.browser_actions,
+            tuple(scene.browser_actions),
             scene.title,
             scene.duration_seconds
         )
@@ -234,27 +801,21 @@ When all actions are complete OR {duration} seconds have elapsed, stop recording
         # TODO: Integrate browser_subagent tool in Phase 2 completion
         
         try:
-            # Initialize Selenium
-            options = webdriver.ChromeOptions()
-            options.add_argument("--headless=new")
-            options.add_argument("--window-size=1920,1080")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            # Enable storage of video/screenshots if possible, or just screenshots for now?
-            # Selenium doesn't natively record video easily without extensions. 
-            # For this MVP, let's capture a sequence of screenshots or just the final state?
-            # The requirement is "Record as WebP".
-            # We can use a screen recorder wrapper or just capture screenshots.
-            # To keep it simple and robust: Capture a high-res screenshot as the "video" frame 
-            # since ffmpeg can take a single image and loop it. 
-            # OR we can actually try to record using a virtual display.
-            # Given constraints: Let's stick to taking a high-quality screenshot after actions.
-            
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
+            # Reuse the shared Chrome session; only reset state between scenes
+            driver = self._get_driver()
             
             # Use URL from config
             target_url = self.config.product.url if self.config else "https://example.com"
+            
+            if not self._cache_warm:
+                # Prime the disk cache so the recorded load is served warm
+                driver.get(target_url)
+                self._wait_ready(driver, timeout=10)
+                self._cache_warm = True
+            
+            driver.delete_all_cookies()
+            self._element_cache.clear()
+            
             print(f"   🌍 Navigating to: {target_url}")
             driver.get(target_url)
             
@@ -263,268 +824,313 @@ When all actions are complete OR {duration} seconds have elapsed, stop recording
             # For this MVP, we just navigate. 
             # If creds are needed, we might need a specific "Login" action in the storyline logic.
             
-            time.sleep(3) # Wait for load
+            self._wait_ready(driver, timeout=10)
             
             # Let's perform the actions using Selenium
             print(f"   📹 Starting browser automation with Selenium...")
             
-            # Create temp dir for frames
-            temp_frames_dir = self.output_dir / "temp_frames" / f"scene_{scene.scene_number}"
-            if temp_frames_dir.exists():
-                shutil.rmtree(temp_frames_dir)
-            temp_frames_dir.mkdir(parents=True, exist_ok=True)
+            # Frames go straight to the recorder's long-lived ffmpeg; encoders that
+            # cannot be split afterwards keep them in memory for finalize()
+            scene.frame_codec = self._frame_codec(driver)
+            scene.frames = []
+            stream = self._frame_stream(scene.frame_codec)
+            sink = stream.put if stream is not None else scene.frames.append
+            stream_start = stream.frames_queued if stream is not None else 0
             
-            # Action Queue
-            action_queue = list(scene.browser_actions)
-            frame_count = 0
             start_time = time.time()
             max_duration = scene.duration_seconds if scene.duration_seconds > 0 else 10
+            min_duration = max_duration if max_duration > 15 else 5
             
-            # Action timing control
-            current_action_idx = 0
-            last_action_time = start_time
-            action_interval = 2.0 # Minimum seconds between actions
+            # Frames are captured on their own clock so slow actions don't stall the
+            # video and fast pages aren't padded by a fixed per-action delay
+            stop_capture = threading.Event()
             
-            print(f"   🎥 Starting interleaved capture/action loop...")
+            def _capture_loop():
+                next_tick = time.monotonic()
+                while not stop_capture.is_set():
+                    try:
+                        sink(self._capture_frame(driver))
+                    except Exception as e:
+                        print(f"      Frame capture warning: {e}")
+                    next_tick += 1 / CAPTURE_FPS
+                    stop_capture.wait(max(0.0, next_tick - time.monotonic()))
             
-            while True:
-                current_time = time.time()
-                elapsed = current_time - start_time
-                
-                # Check exit conditions
-                if not action_queue and elapsed > (max_duration if max_duration > 15 else 5): 
-                    # If actions done and we recorded enough (min 5s or duration), break
-                    break
-                
-                if elapsed > max_duration + 10: # Safety timeout
-                    break
+            capture_thread = threading.Thread(target=_capture_loop, daemon=True)
+            
+            print(f"   🎥 Starting capture thread and action sequence...")
+            capture_thread.start()
+            
+            try:
+                for action in scene.parsed_actions:
+                    if time.time() - start_time > max_duration + 10: # Safety timeout
+                        print("   ⏱️  Scene timed out, skipping remaining actions")
+                        break
                     
-                # 1. Capture Frame
-                try:
-                    filename = temp_frames_dir / f"frame_{frame_count:05d}.png"
-                    driver.save_screenshot(str(filename))
-                    frame_count += 1
-                except Exception as e:
-                    print(f"      Frame capture warning: {e}")
-                
-                # 2. Execute Next Action (if ready)
-                if action_queue and (current_time - last_action_time > action_interval):
-                    action = action_queue.pop(0)
-                    print(f"   ▶️  Executing: {action}")
+                    print(f"   ▶️  Executing: {action.raw}")
                     try:
                         self.execute_action(driver, action)
-                        # Capture immediately after action
-                        filename = temp_frames_dir / f"frame_{frame_count:05d}.png"
-                        driver.save_screenshot(str(filename))
-                        frame_count += 1
+                        # Move on as soon as the page has settled
+                        self._wait_ready(driver)
                     except Exception as e:
                          print(f"      Action failed: {e}")
-                    
-                    last_action_time = time.time()
-                    
-                # Throttle loop to ~5 FPS
-                time.sleep(0.2) 
+                
+                # Actions done: keep recording until the minimum length (5s or duration)
+                remaining = min_duration - (time.time() - start_time)
+                if remaining > 0:
+                    stop_capture.wait(remaining)
+            finally:
+                stop_capture.set()
+                capture_thread.join()
+                if stream is not None:
+                    frame_count = stream.end_scene(scene, stream_start)
+                else:
+                    frame_count = len(scene.frames)
             
             print(f"   🛑 Recording finished. Frames: {frame_count}")
             
-            driver.quit()
-            
-            # Stitch video with ffmpeg
-            if frame_count > 0:
-                print(f"   🎞️  Stitching {frame_count} frames to video...")
-                output_video = str(scene.recording_path).replace('.webp', '.mp4')
-                
-                # Update scene path to mp4
-                scene.recording_path = Path(output_video)
-                
-                try:
-                    # ffmpeg -framerate 5 -i frame_%05d.png -c:v libx264 -pix_fmt yuv420p output.mp4
-                    cmd = [
-                        "ffmpeg",
-                        "-y", # Overwrite
-                        "-framerate", "5",
-                        "-i", str(temp_frames_dir / "frame_%05d.png"),
-                        "-c:v", "libx264",
-                        "-pix_fmt", "yuv420p",
-                        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
-                        output_video
-                    ]
-                    
-                    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    print(f"   ✅ Saved video: {scene.recording_path}")
-                    
-                    # Cleanup frames
-                    shutil.rmtree(temp_frames_dir)
-                    scene.status = "success"
-                    return True
-                    
-                except Exception as e:
-                     print(f"   ❌ FFmpeg stitching failed: {e}")
-                     scene.status = "failed"
-                     return False
-            else:
+            if not frame_count:
                  print("   ⚠️  No frames captured")
                  scene.status = "failed"
                  return False
             
+            scene.status = "captured"
+            return True
+            
         except Exception as e:
             print(f"   ❌ Recording failed: {e}")
             scene.status = "failed"
             scene.error_message = str(e)
             return False
 
-    def execute_action(self, driver: webdriver.Chrome, action: str):
-        """Parse and execute a single browser action"""
-        print(f"      Running: {action}")
-        action = action.strip()
-        
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
+    def execute_action(self, driver: webdriver.Chrome, action: Union[str, ParsedAction]):
+        """Execute a single browser action (pre-parsed, or parsed on the fly)"""
+        if isinstance(action, str):
+            action = parse_action(action)
+        print(f"      Running: {action.raw}")
         
         try:
-            if action.lower().startswith("wait"):
-                # Parse "Wait X seconds"
-                parts = action.split()
-                seconds = 2
-                for part in parts:
-                    if part.isdigit():
-                        seconds = int(part)
-                        break
-                time.sleep(seconds)
+            self._handlers.get(action.kind, self._do_unknown)(driver, action)
+        except Exception as e:
+            print(f"      ❌ Action error: {e}")
+    
+    def _do_wait(self, driver: webdriver.Chrome, action: ParsedAction):
+        time.sleep(action.seconds)
+    
+    def _do_click(self, driver: webdriver.Chrome, action: ParsedAction):
+        target_text = action.target
+        print(f"      🔍 Searching for element with text: '{target_text}'")
+        
+        # Strategy 1: Exact text match (fastest)
+        # Strategy 2: Case-insensitive text match (XPath 1.0 hack)
+        # Strategy 3: Partial text match
+        # Strategy 4: Placeholder/Aria-label/ID
+        
+        t = _xpath_literal(target_text)
+        xpath_strategies = [
+            f"//*[text()={t}]",
+            f"//*[contains(text(), {t})]",
+            f"//button[contains(., {t})]",
+            f"//a[contains(., {t})]",
+            f"//*[@role='button' and contains(., {t})]",
+            f"//*[@aria-label={t}]",
+            f"//*[@placeholder={t}]",
+            f"//*[@id={t}]",
+            # Case insensitive approach
+            f"//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), {_xpath_literal(target_text.lower())})]"
+        ]
+        
+        # All strategies are probed in-page with a single WebDriver round trip;
+        # the match is scrolled into view and highlighted for the recording
+        found = self._find_visible(
+            driver, f"click:{target_text}", xpath_strategies, "3px solid red", True
+        )
                 
-            elif action.lower().startswith("click"):
-                # Parse "Click [Text]..."
-                target = action[5:].strip()
-                # Remove "button", "link" etc if present to just get the text/id
-                # Heuristic: Try to find by text content first
+        if found:
+            element, xpath = found
+            print(f"      ✅ Found by xpath: {xpath}")
+            try:
+                time.sleep(0.7)
                 
-                # Check for quotes
-                if "'" in target:
-                    target_text = target.split("'")[1]
-                elif '"' in target:
-                    target_text = target.split('"')[1]
+                # Try standard click
+                try:
+                    element.click()
+                except:
+                    # Fallback to JS click
+                    print("      ⚠️ Standard click failed, trying JS click")
+                    driver.execute_script("arguments[0].click();", element)
+                return
+            except Exception as e:
+                print(f"      ❌ Click interaction failed: {e}")
+        else:
+            print(f"      ⚠️ Could not find element to click: {target_text}")
+    
+    def _do_type(self, driver: webdriver.Chrome, action: ParsedAction):
+        text_to_type = action.text
+        target_name = action.target
+        
+        target_el = None
+        
+        if target_name:
+            # Try finding input by specific target name/placeholder
+            print(f"      🔍 Searching for input: '{target_name}'")
+            t = _xpath_literal(target_name)
+            xpaths = [
+                f"//input[@placeholder={t}]",
+                f"//input[@name={t}]",
+                f"//input[@id={t}]",
+                f"//input[@aria-label={t}]",
+                f"//textarea[@placeholder={t}]",
+                f"//label[contains(text(), {t})]/following::input[1]"
+            ]
+            found = self._find_visible(
+                driver, f"type:{target_name}", xpaths, "3px solid blue", False
+            )
+            if found:
+                target_el = found[0]
+        
+        if not target_el:
+            # Fallback: Find first visible input or active element
+            try:
+                target_el = driver.switch_to.active_element
+                if target_el.tag_name not in ['input', 'textarea']:
+                    target_el = None
                 else:
-                    target_text = target
-                    
-                print(f"      🔍 Searching for element with text: '{target_text}'")
-                
-                # Strategy 1: Exact text match (fastest)
-                # Strategy 2: Case-insensitive text match (XPath 1.0 hack)
-                # Strategy 3: Partial text match
-                # Strategy 4: Placeholder/Aria-label/ID
+                    driver.execute_script("arguments[0].style.border='3px solid blue';", target_el)
+            except:
+                pass
                 
-                xpath_strategies = [
-                    f"//*[text()='{target_text}']",
-                    f"//*[contains(text(), '{target_text}')]",
-                    f"//button[contains(., '{target_text}')]",
-                    f"//a[contains(., '{target_text}')]",
-                    f"//*[@role='button' and contains(., '{target_text}')]",
-                    f"//*[@aria-label='{target_text}']",
-                    f"//*[@placeholder='{target_text}']",
-                    f"//*[@id='{target_text}']",
-                    # Case insensitive approach
-                    f"//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{target_text.lower()}')]"
-                ]
-                
-                element = None
-                for xpath in xpath_strategies:
-                    try:
-                        elements = driver.find_elements(By.XPATH, xpath)
-                        # Filter for displayed elements
-                        visible_elements = [e for e in elements if e.is_displayed()]
-                        if visible_elements:
-                            element = visible_elements[0]
-                            print(f"      ✅ Found by xpath: {xpath}")
-                            break
-                    except:
-                        continue
-                        
-                if element:
-                    try:
-                        # Scroll into view
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                        time.sleep(0.5)
-                        # Highlight for visual debugging/recording
-                        driver.execute_script("arguments[0].style.border='3px solid red';", element)
-                        time.sleep(0.2)
-                        
-                        # Try standard click
-                        try:
-                            element.click()
-                        except:
-                            # Fallback to JS click
-                            print("      ⚠️ Standard click failed, trying JS click")
-                            driver.execute_script("arguments[0].click();", element)
-                        return
-                    except Exception as e:
-                        print(f"      ❌ Click interaction failed: {e}")
-                else:
-                    print(f"      ⚠️ Could not find element to click: {target_text}")
-                    
-            elif action.lower().startswith("type"):
-                # Parse "Type 'text' in [Element]"
-                import re
-                matches = re.findall(r"['\"](.*?)['\"]", action)
-                if len(matches) >= 1:
-                    text_to_type = matches[0]
-                    target_name = matches[1] if len(matches) >= 2 else None
-                    
-                    target_el = None
-                    
-                    if target_name:
-                         # Try finding input by specific target name/placeholder
-                         print(f"      🔍 Searching for input: '{target_name}'")
-                         xpaths = [
-                             f"//input[@placeholder='{target_name}']",
-                             f"//input[@name='{target_name}']",
-                             f"//input[@id='{target_name}']",
-                             f"//input[@aria-label='{target_name}']",
-                             f"//textarea[@placeholder='{target_name}']",
-                             f"//label[contains(text(), '{target_name}')]/following::input[1]"
-                         ]
-                         for xpath in xpaths:
-                             try:
-                                 visible_elements = [e for e in driver.find_elements(By.XPATH, xpath) if e.is_displayed()]
-                                 if visible_elements:
-                                     target_el = visible_elements[0]
-                                     break
-                             except:
-                                 continue
-                    
-                    if not target_el:
-                         # Fallback: Find first visible input or active element
-                         try:
-                             target_el = driver.switch_to.active_element
-                             if target_el.tag_name not in ['input', 'textarea']:
-                                 target_el = None
-                         except:
-                             pass
-                             
-                    if target_el:
-                        try:
-                            # Highlight
-                            driver.execute_script("arguments[0].style.border='3px solid blue';", target_el)
-                            target_el.clear()
-                            for char in text_to_type:
-                                target_el.send_keys(char)
-                                time.sleep(0.05) # Type naturally
-                        except Exception as e:
-                            print(f"      ❌ Type interaction failed: {e}")
-                    else:
-                        print(f"      ⚠️ Could not find input to type: {text_to_type}")
-                        
-            elif action.lower().startswith("navigate"):
-                # "Navigate to [URL]"
-                if "http" in action:
-                    import re
-                    urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', action)
-                    if urls:
-                        print(f"      🌍 Navigating to: {urls[0]}")
-                        driver.get(urls[0])
-                        
-        except Exception as e:
-            print(f"      ❌ Action error: {e}")
+        if target_el:
+            try:
+                target_el.clear()
+                for char in text_to_type:
+                    target_el.send_keys(char)
+                    time.sleep(0.05) # Type naturally
+            except Exception as e:
+                print(f"      ❌ Type interaction failed: {e}")
+        else:
+            print(f"      ⚠️ Could not find input to type: {text_to_type}")
+    
+    def _do_navigate(self, driver: webdriver.Chrome, action: ParsedAction):
+        print(f"      🌍 Navigating to: {action.target}")
+        driver.get(action.target)
+    
+    def _do_unknown(self, driver: webdriver.Chrome, action: ParsedAction):
+        print(f"      ⚠️ Unrecognized action, skipping: {action.raw}")
+    
+    def finalize(self, scenes: List[SceneRecording]):
+        """
+        Encode captured scenes whose frames are still held in memory
+        
+        Scenes recorded through a FrameStream are already saved by flush();
+        this covers the rest. Frames of every scene are piped back-to-back into
+        one encoder and the segment muxer cuts the stream at the scene
+        boundaries, so ffmpeg start-up and codec init are paid once.
+        """
+        captured = [s for s in scenes if s.status == "captured" and s.frames]
+        if not captured:
+            return
+        
+        profile = ENCODERS[self.encoder]
+        print(f"\n🎞️  Encoder: {self.encoder}")
+        
+        # One pipe carries one image codec; normally every scene shares the same one
+        for codec in sorted({s.frame_codec for s in captured}):
+            batch = [s for s in captured if s.frame_codec == codec]
+            if profile.segmentable:
+                self._encode_batch(batch, codec, profile)
+            else:
+                # Whole-clip encoders (animated WebP) cannot be split afterwards
+                for scene in batch:
+                    self._encode_batch([scene], codec, profile)
+    
+    def _encode_batch(self, batch: List[SceneRecording], codec: str, profile: EncoderProfile):
+        """Encode scenes sharing a frame codec and split them back into per-scene files"""
+        print(f"🎞️  Encoding {len(batch)} scene(s) in one ffmpeg pass...")
+        
+        # Frame offsets where each following scene starts
+        boundaries = []
+        total_frames = 0
+        for scene in batch[:-1]:
+            total_frames += len(scene.frames)
+            boundaries.append(total_frames)
+        
+        for scene in batch:
+            scene.recording_path = scene.recording_path.with_suffix(profile.suffix)
+        
+        segment_dir = self._scratch_dir()
+        cmd = [
+            "ffmpeg",
+            "-y", # Overwrite
+            "-hide_banner", "-loglevel", "error",
+            *profile.input_args,
+            "-f", "image2pipe",
+            "-framerate", str(CAPTURE_FPS),
+            "-c:v", codec,
+            "-i", "-",
+            *profile.output_args,
+        ]
+        if boundaries:
+            # Keyframes at the boundaries let the segment muxer cut exactly there
+            cmd += [
+                "-force_key_frames", "expr:" + "+".join(f"eq(n,{b})" for b in boundaries),
+                "-f", "segment",
+                "-segment_frames", ",".join(str(b) for b in boundaries),
+                "-reset_timestamps", "1",
+                str(segment_dir / f"segment_%03d{profile.suffix}")
+            ]
+        else:
+            cmd.append(str(batch[0].recording_path))
+        
+        # stderr goes to a spooled file rather than a pipe so a chatty encoder
+        # can never block while we are still writing frames to stdin
+        with tempfile.TemporaryFile() as stderr_log:
+            encoder = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=stderr_log
+            )
+            try:
+                for scene in batch:
+                    for frame in scene.frames:
+                        encoder.stdin.write(frame)
+            except BrokenPipeError:
+                pass
+            finally:
+                try:
+                    encoder.stdin.close()
+                except BrokenPipeError:
+                    pass
+                returncode = encoder.wait()
+            
+            error_output = ""
+            if returncode != 0:
+                stderr_log.seek(0)
+                error_output = stderr_log.read().decode('utf-8', errors='replace').strip()
+                if error_output:
+                    print(f"   ❌ FFmpeg: {error_output.splitlines()[-1]}")
+        
+        for i, scene in enumerate(batch):
+            scene.frames = []  # release captured frames
+            
+            if returncode != 0:
+                print(f"   ❌ Scene {scene.scene_number}: FFmpeg encoding failed (exit code {returncode})")
+                scene.status = "failed"
+                scene.error_message = error_output or f"ffmpeg exited with code {returncode}"
+                continue
+            
+            if boundaries:
+                segment = segment_dir / f"segment_{i:03d}{profile.suffix}"
+                if not segment.exists():
+                    print(f"   ❌ Scene {scene.scene_number}: missing encoded segment")
+                    scene.status = "failed"
+                    continue
+                segment.replace(scene.recording_path)
+            
+            print(f"   ✅ Saved video: {scene.recording_path}")
+            scene.status = "success"
+        
+        # Drop leftovers (e.g. from a failed encode) so the next batch starts clean
+        with os.scandir(segment_dir) as entries:
+            for entry in entries:
+                os.unlink(entry.path)
     
     def generate_manifest(self, scenes: List[SceneRecording], output_path: Path):
         """Generate JSON manifest of all recordings"""
@@ -551,6 +1157,62 @@ When all actions are complete OR {duration} seconds have elapsed, stop recording
         print(f"\n📄 Manifest saved: {output_path}")
 
 
+def record_scenes(
+    scenes: Iterable[SceneRecording],
+    output_dir: Path,
+    config=None,
+    driver_path: Optional[str] = None,
+    max_workers: int = 4,
+    encoder: Optional[str] = None
+) -> List[SceneRecording]:
+    """
+    Record independent scenes concurrently
+    
+    Selenium sessions are not thread-safe, so each worker thread lazily gets
+    its own BrowserRecorder (and Chrome instance) which it reuses for every
+    scene it picks up. The work is IO-bound (Chrome + ffmpeg subprocesses),
+    so threads are sufficient.
+    
+    Scenes may be a lazy iterator (e.g. StorylineParser.iter_scenes); each one
+    is dispatched as soon as it is parsed. Returns the scenes in input order.
+    """
+    local = threading.local()
+    recorders = []
+    recorders_lock = threading.Lock()
+    
+    def _record(scene: SceneRecording) -> bool:
+        recorder = getattr(local, "recorder", None)
+        if recorder is None:
+            with recorders_lock:
+                profile_dir = CHROME_PROFILE_DIR / f"worker_{len(recorders)}"
+                recorder = BrowserRecorder(
+                    output_dir, config, driver_path=driver_path,
+                    encoder=encoder, profile_dir=profile_dir
+                )
+                recorders.append(recorder)
+            local.recorder = recorder
+        return recorder.record_scene(scene)
+    
+    recorded = []
+    
+    def _submit(scene: SceneRecording) -> SceneRecording:
+        recorded.append(scene)
+        return scene
+    
+    # Idle workers are never spawned, so no need to size the pool to the scene count
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            list(pool.map(_record, map(_submit, scenes)))
+        # Each worker's ffmpeg has been encoding all along; finish and split them
+        for recorder in recorders:
+            recorder.flush()
+    finally:
+        for recorder in recorders:
+            recorder.close()
+    
+    return recorded
+
+
 def main():
     """Main execution"""
     import argparse
@@ -571,6 +1233,18 @@ def main():
         default="../01_raw_recordings",
         help="Output directory for recordings"
     )
+    parser.add_argument(
+        "--encoder",
+        choices=["auto", *ENCODERS],
+        default=None,
+        help="Video encoder for recordings (default: Product_Specs recording.encoder)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of scenes to record in parallel (one headless Chrome each)"
+    )
     
     args = parser.parse_args()
     
@@ -586,20 +1260,25 @@ def main():
     print(f"Output: {output_dir}")
     print()
     
-    # Parse storyline
+    # Parse storyline lazily; scenes are dispatched to recorders as they are found
     print("📖 Parsing storyline...")
     parser = StorylineParser(storyline_path)
-    scenes = parser.parse_scenes()
-    print(f"✅ Found {len(scenes)} scenes")
-    print()
     
     # Record each scene
-    from config_loader import load_config
     config = load_config(str(config_path))
-    recorder = BrowserRecorder(output_dir, config)
     
-    for scene in scenes:
-        recorder.record_scene(scene)
+    # Resolve chromedriver once per run; install() does network/disk checks on every call
+    driver_path = ChromeDriverManager().install()
+    scenes = record_scenes(
+        parser.iter_scenes(), output_dir, config, driver_path,
+        max_workers=args.workers, encoder=args.encoder
+    )
+    print(f"\n✅ Processed {len(scenes)} scenes")
+    
+    # Encode scenes that were not streamed (whole-clip encoders) in a single ffmpeg pass
+    recorder = BrowserRecorder(output_dir, config, driver_path=driver_path, encoder=args.encoder)
+    recorder.finalize(scenes)
+    recorder.close()
     
     # Generate manifest
     manifest_path = output_dir / "recording_manifest.json"
@@ -6,15 +6,49 @@ Outputs both SRT and ASS formats for FFmpeg burning.
 """
 
 import os
+import hashlib
+import tempfile
+import threading
 from pathlib import Path
-from google import genai
-from google.genai import types
-from dotenv import load_dotenv
+from typing import List, Optional, TYPE_CHECKING
+from concurrent.futures import Future
+from pydantic import BaseModel, TypeAdapter
+
+# google.genai pulls in a large dependency tree; it is imported only when transcribing
+if TYPE_CHECKING:
+    from google import genai
 
 from config_loader import load_config, DemoConfig
 
-# Load environment variables
-load_dotenv()
+# SRT uses a decimal comma, ASS a decimal point
+_COMMA_TO_DOT = str.maketrans({',': '.'})
+
+# ASS Header with styling
+_ASS_HEADER = """[Script Info]
+Title: Product Demo Captions
+ScriptType: v4.00+
+WrapStyle: 0
+PlayResX: 1920
+PlayResY: 1080
+ScaledBorderAndShadow: yes
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Montserrat Bold,48,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,-1,0,0,0,100,100,0,0,1,2,1,2,10,10,80,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+
+class WordTimestamp(BaseModel):
+    """Single transcribed word with its position in the audio (seconds)"""
+    word: str
+    start: float
+    end: float
+
+
+_WORDS_ADAPTER = TypeAdapter(list[WordTimestamp])
 
 
 class Caption:
@@ -29,19 +63,115 @@ class Caption:
         """Convert to SRT format"""
         def format_time(seconds: float) -> str:
             """Convert seconds to SRT time format (HH:MM:SS,mmm)"""
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            secs = int(seconds % 60)
-            millis = int((seconds % 1) * 1000)
+            # Work in integer milliseconds so 59.9995s rolls over to 1:00,000
+            secs, millis = divmod(int(round(seconds * 1000)), 1000)
+            minutes, secs = divmod(secs, 60)
+            hours, minutes = divmod(minutes, 60)
             return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
         
         return f"{self.index}\n{format_time(self.start)} --> {format_time(self.end)}\n{self.text}\n"
 
 
+def _make_client() -> "genai.Client":
+    """Create the Gemini client from GEMINI_API_KEY"""
+    from google import genai
+    from dotenv import load_dotenv
+    
+    # Load environment variables
+    load_dotenv()
+    
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in environment variables")
+    return genai.Client(api_key=api_key)
+
+
+def _start_client() -> Future:
+    """
+    Build the Gemini client on a daemon thread
+    
+    Unlike an executor, nothing joins the thread: a cache hit returns without
+    waiting for it, and the process may exit while it is still importing.
+    """
+    future = Future()
+    
+    def _run():
+        try:
+            future.set_result(_make_client())
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=_run, daemon=True).start()
+    return future
+
+
+def _audio_digest(audio_path: str) -> str:
+    """SHA-256 of the audio file, streamed from disk"""
+    with open(audio_path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def _transcribe_words(client: "genai.Client", audio_path: str) -> list[WordTimestamp]:
+    """Transcribe audio with Gemini, returning word-level timings"""
+    from google.genai import types
+    
+    # Upload via the Files API so the SDK streams the MP3 from disk
+    # instead of holding the whole file in memory
+    print("🎙️  Transcribing audio with Gemini Speech-to-Text...")
+    audio_file = client.files.upload(
+        file=audio_path,
+        config=types.UploadFileConfig(mime_type="audio/mpeg")
+    )
+    
+    try:
+        # Transcribe with Gemini, asking for real word-level timings
+        response = client.models.generate_content(
+            model='gemini-2.5-flash',
+            contents=[
+                "Transcribe this audio exactly as spoken. Return every spoken word in order "
+                "with its start and end time in seconds from the beginning of the audio.",
+                audio_file
+            ],
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=list[WordTimestamp]
+            )
+        )
+    finally:
+        # Uploaded files count against the project quota until deleted
+        try:
+            client.files.delete(name=audio_file.name)
+        except Exception as e:
+            print(f"⚠️  Could not delete uploaded audio: {e}")
+    
+    # parsed is None when the output doesn't fit the schema; validate the raw text so
+    # that fails loudly instead of passing for a silent, empty transcription
+    if response.parsed is not None:
+        return response.parsed
+    return _WORDS_ADAPTER.validate_json(response.text or "")
+
+
+def _read_cached_words(cache_file: Path) -> Optional[list[WordTimestamp]]:
+    """Cached transcription, or None if there is none or it is unreadable (a miss)"""
+    try:
+        return _WORDS_ADAPTER.validate_json(cache_file.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_words(cache_file: Path, words: list[WordTimestamp]):
+    """Write the cache entry atomically, so an interrupted run can't leave it truncated"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('wb', dir=cache_file.parent, suffix='.tmp', delete=False) as f:
+        f.write(_WORDS_ADAPTER.dump_json(words))
+    os.replace(f.name, cache_file)
+
+
 def generate_captions(
     audio_path: str,
     config: DemoConfig,
-    output_path: str = "../OUTPUT/captions/captions.srt"
+    output_path: str = "../OUTPUT/captions/captions.srt",
+    ass_path: Optional[str] = None
 ) -> str:
     """
     Generate word-level captions from voiceover audio using Gemini Speech-to-Text API
@@ -50,6 +180,7 @@ def generate_captions(
         audio_path: Path to voiceover MP3 file
         config: DemoConfig (not used but kept for consistency)
         output_path: Where to save SRT file
+        ass_path: If set, also write the styled ASS file directly from the captions
         
     Returns:
         Path to generated SRT file
@@ -59,60 +190,41 @@ def generate_captions(
     print(f"   Audio: {audio_path}")
     
     try:
-        # Get Gemini API key
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
-        
-        client = genai.Client(api_key=api_key)
-        
-        # Read audio file
-        print("🎙️  Transcribing audio with Gemini Speech-to-Text...")
-        with open(audio_path, 'rb') as f:
-            audio_data = f.read()
-        
-        # Create audio part for Gemini
-        audio_part = types.Part.from_bytes(
-            data=audio_data,
-            mime_type="audio/mpeg"
-        )
+        output_file = Path(output_path)
         
-        # Transcribe with Gemini
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            contents=[
-                "Transcribe this audio exactly as spoken. Output only the transcription text, no other commentary.",
-                audio_part
-            ]
-        )
+        # Client setup (google.genai import, TLS warm-up) overlaps hashing the audio and
+        # reading the cache; only a cache miss waits for it
+        client_future = _start_client()
         
-        transcription_text = response.text.strip()
-        print(f"✅ Transcription complete: {len(transcription_text)} characters")
+        # Transcriptions are cached by audio content, so unchanged voiceovers skip the API
+        audio_hash = _audio_digest(audio_path)
+        cache_file = output_file.parent / ".cache" / f"{audio_hash}.json"
         
-        # Estimate timing (since Gemini doesn't provide word-level timestamps)
-        # We'll create captions in ~4-second chunks for readability
-        words = transcription_text.split()
-        words_per_caption = 8  # ~4 seconds at 145 WPM (145/60 * 4 ≈ 9.7 words)
+        words = _read_cached_words(cache_file)
+        if words:
+            print("♻️  Using cached transcription (audio unchanged)")
+        else:
+            words = _transcribe_words(client_future.result(), audio_path)
+            # An empty transcription is a failure, not a result worth replaying
+            if words:
+                _write_cached_words(cache_file, words)
+        print(f"✅ Transcription complete: {len(words)} words")
         
-        captions = []
-        current_time = 0.0
-        caption_duration = 4.0  # seconds per caption
+        # Group consecutive words into short captions timed by the words themselves
+        words_per_caption = 8  # ~4 seconds at 145 WPM
         
+        captions = []
         for i in range(0, len(words), words_per_caption):
             chunk = words[i:i + words_per_caption]
-            caption_text = " ".join(chunk)
             
             captions.append(Caption(
                 index=len(captions) + 1,
-                start=current_time,
-                end=current_time + caption_duration,
-                text=caption_text
+                start=chunk[0].start,
+                end=chunk[-1].end,
+                text=" ".join(w.word for w in chunk)
             ))
-            
-            current_time += caption_duration
         
         # Write SRT file
-        output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -125,6 +237,10 @@ def generate_captions(
         print(f"   Total captions: {len(captions)}")
         print()
         
+        # The burn path needs ASS; build it from the captions instead of re-reading the SRT
+        if ass_path:
+            write_ass_file(captions, config, ass_path)
+        
         return str(output_file)
         
     except Exception as e:
@@ -132,6 +248,43 @@ def generate_captions(
         raise
 
 
+def secs_to_ass(seconds: float) -> str:
+    """Convert seconds to ASS time (HH:MM:SS.cc)"""
+    secs, centis = divmod(int(round(seconds * 100)), 100)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+
+def captions_to_ass(captions: List[Caption], config: DemoConfig) -> str:
+    """Render captions as a styled ASS document"""
+    lines = [
+        f"Dialogue: 0,{secs_to_ass(c.start)},{secs_to_ass(c.end)},Default,,0,0,0,,{c.text}\n"
+        for c in captions
+    ]
+    return _ASS_HEADER + "".join(lines)
+
+
+def write_ass_file(captions: List[Caption], config: DemoConfig, output_path: str) -> str:
+    """Write captions straight to a styled ASS file, skipping the SRT round trip"""
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(captions_to_ass(captions, config), encoding='utf-8')
+    
+    print(f"✅ Styled ASS file created!")
+    print(f"   Saved to: {output_file}")
+    print(f"   Style: Montserrat Bold, 48px, White with black outline")
+    print()
+    
+    return str(output_file)
+
+
+def srt_time_to_ass(srt_time: str) -> str:
+    """Convert SRT time (HH:MM:SS,mmm) to ASS time (HH:MM:SS.cc)"""
+    # Dropping the last millisecond digit truncates to centiseconds
+    return srt_time.translate(_COMMA_TO_DOT)[:-1]
+
+
 def create_styled_ass_file(
     srt_path: str,
     config: DemoConfig,
@@ -154,53 +307,42 @@ def create_styled_ass_file(
     # Read SRT file
     srt_content = Path(srt_path).read_text(encoding='utf-8')
     
-    # Parse SRT
-    import re
-    caption_pattern = r'(\d+)\n([\d:,]+)\s+-->\s+([\d:,]+)\n(.*?)(?=\n\n|\Z)'
-    matches = re.findall(caption_pattern, srt_content, re.DOTALL)
-    
-    # ASS Header with styling
-    ass_header = """[Script Info]
-Title: Product Demo Captions
-ScriptType: v4.00+
-WrapStyle: 0
-PlayResX: 1920
-PlayResY: 1080
-ScaledBorderAndShadow: yes
-
-[V4+ Styles]
-Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-Style: Default,Montserrat Bold,48,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,-1,0,0,0,100,100,0,0,1,2,1,2,10,10,80,1
-
-[Events]
-Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-"""
-    
-    # Convert SRT timestamps to ASS format (H:MM:SS.cc)
-    def srt_time_to_ass(srt_time: str) -> str:
-        """Convert SRT time (HH:MM:SS,mmm) to ASS time (H:MM:SS.cc)"""
-        time_part, millis = srt_time.split(',')
-        centiseconds = int(millis) // 10
-        return f"{time_part}.{centiseconds:02d}"
-    
-    # Build ASS events
-    ass_events = []
-    for idx, start, end, text in matches:
-        start_ass = srt_time_to_ass(start.strip())
-        end_ass = srt_time_to_ass(end.strip())
-        text_clean = text.strip().replace('\n', ' ')
-        
-        # ASS dialogue line
-        line = f"Dialogue: 0,{start_ass},{end_ass},Default,,0,0,0,,{text_clean}"
-        ass_events.append(line)
-    
-    # Combine header and events
-    ass_content = ass_header + '\n'.join(ass_events)
-    
-    # Write ASS file
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    output_file.write_text(ass_content, encoding='utf-8')
+    
+    # Stream header and dialogue lines straight to disk
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as ass:
+        ass.write(_ASS_HEADER)
+        
+        def write_dialogue(start: str, end: str, text_lines: list):
+            """Append one ASS dialogue line"""
+            text_clean = ' '.join(text_lines)
+            ass.write(f"Dialogue: 0,{srt_time_to_ass(start)},{srt_time_to_ass(end)},Default,,0,0,0,,{text_clean}\n")
+        
+        # Parse SRT in one pass: index line -> timing line -> text lines until a blank line
+        state = "order"
+        start = end = ""
+        text_lines = []
+        for line in srt_content.splitlines():
+            line = line.strip()
+            if state == "order":
+                if line.isdigit():
+                    state = "time"
+            elif state == "time":
+                start, arrow, end = line.partition('-->')
+                if arrow:
+                    start, end = start.strip(), end.strip()
+                    text_lines = []
+                    state = "text"
+                else:
+                    state = "order"
+            elif line:
+                text_lines.append(line)
+            else:
+                write_dialogue(start, end, text_lines)
+                state = "order"
+        if state == "text":
+            write_dialogue(start, end, text_lines)
     
     print(f"✅ Styled ASS file created!")
     print(f"   Saved to: {output_file}")
@@ -220,11 +362,9 @@ if __name__ == "__main__":
     try:
         config = load_config(config_path)
         
-        # Generate SRT
-        srt_path = generate_captions(audio_path, config)
-        
-        # Create styled ASS file
-        ass_path = create_styled_ass_file(srt_path, config)
+        # Generate SRT and the styled ASS file in one pass
+        ass_path = "../OUTPUT/captions/captions_styled.ass"
+        srt_path = generate_captions(audio_path, config, ass_path=ass_path)
         
         print("✅ Captions ready for video composition!")
         print(f"   SRT: {srt_path}")
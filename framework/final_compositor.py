@@ -8,7 +8,11 @@ This is the most straightforward approach given we have a complete 4-minute back
 
 import subprocess
 import os
+import sys
+import shutil
+import argparse
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Asset Paths
 BASE_DIR = Path(__file__).parent.parent
@@ -21,9 +25,41 @@ OUTPUT_FILE = OUTPUT_DIR / "Final_Demo_Video.mp4"
 # Primary Video
 BELMIX_AD = RECORDINGS_DIR / "belmix_raw_ad_gen_edited.mov"
 
+# Video encoder arguments; captions are burned into every frame, so the video is
+# always re-encoded and the hardware encoders are the fast path
+VIDEO_ENCODERS = {
+    "libx264": [
+        "-c:v", "libx264", "-preset", "veryfast", "-tune", "fastdecode",
+        "-crf", "20", "-threads", str(os.cpu_count() or 0)
+    ],
+    "h264_videotoolbox": ["-c:v", "h264_videotoolbox", "-b:v", "8M"],
+    "h264_nvenc": ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"],
+}
+
 # Ensure output directory exists
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+
+def pick_video_encoder(name: str = "auto") -> str:
+    """Resolve 'auto' to VideoToolbox on macOS, NVENC on NVIDIA hosts, else libx264"""
+    if name != "auto":
+        if name not in VIDEO_ENCODERS:
+            raise ValueError(f"Unknown encoder '{name}'. Choose from: auto, {', '.join(VIDEO_ENCODERS)}")
+        return name
+    
+    try:
+        available = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        ).stdout.decode()
+    except OSError:
+        available = ""
+    if sys.platform == "darwin" and " h264_videotoolbox " in available:
+        return "h264_videotoolbox"
+    if shutil.which("nvidia-smi") and " h264_nvenc " in available:
+        return "h264_nvenc"
+    return "libx264"
+
 def get_video_duration(video_path):
     """Get video duration in seconds"""
     cmd = [
@@ -32,10 +68,30 @@ def get_video_duration(video_path):
         "-of", "default=noprint_wrappers=1:nokey=1",
         str(video_path)
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return float(result.stdout.strip())
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return float(result.stdout)
+
+def run_with_progress(cmd, duration: float):
+    """Run ffmpeg and render its -progress output as a percentage bar"""
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    for line in proc.stdout:
+        # out_time_ms is reported in microseconds, despite the name
+        if line.startswith("out_time_ms=") and duration > 0:
+            try:
+                done = int(line.split("=", 1)[1]) / 1_000_000
+            except ValueError:
+                continue
+            pct = min(100.0, done / duration * 100)
+            bar = "█" * int(pct // 5)
+            print(f"\r   [{bar:<20}] {pct:5.1f}%", end="", flush=True)
+    print()
+    
+    returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
 
-def main():
+def main(encoder: str = "auto"):
     print("="*80)
     print("🎬 FINAL DEMO VIDEO COMPOSITION")
     print("="*80)
@@ -43,9 +99,15 @@ def main():
     print("Strategy: Use Belmix raw ad + voiceover overlay + captions")
     print()
     
-    # Get durations
-    video_duration = get_video_duration(BELMIX_AD)
-    vo_duration = get_video_duration(VOICEOVER)
+    encoder = pick_video_encoder(encoder)
+    print(f"🎞️  Video encoder: {encoder}")
+    print()
+    
+    # Get durations (independent ffprobe runs, so overlap their start-up)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        video_future = pool.submit(get_video_duration, BELMIX_AD)
+        vo_future = pool.submit(get_video_duration, VOICEOVER)
+        video_duration, vo_duration = video_future.result(), vo_future.result()
     
     print(f"📊 Video Duration: {video_duration:.1f}s ({video_duration/60:.1f} min)")
     print(f"📊 Voiceover Duration: {vo_duration:.1f}s ({vo_duration/60:.1f} min)")
@@ -65,6 +127,8 @@ def main():
     # Single FFmpeg command: trim video, add voiceover, burn captions
     cmd = [
         "ffmpeg", "-y",
+        "-loglevel", "error",
+        "-progress", "pipe:1", "-nostats",  # machine-readable progress on stdout
         "-i", str(BELMIX_AD),          # Video input
         "-i", str(VOICEOVER),          # Audio input
         "-t", str(final_duration),     # Trim to final duration
@@ -72,17 +136,16 @@ def main():
         f"[0:v]ass={CAPTIONS.absolute()}[v]",  # Burn captions
         "-map", "[v]",                  # Use filtered video
         "-map", "1:a",                  # Use voiceover audio
-        "-c:v", "libx264",
-        "-preset", "medium",
-        "-crf", "23",
+        *VIDEO_ENCODERS[encoder],
         "-pix_fmt", "yuv420p",
         "-c:a", "aac",
         "-b:a", "192k",
+        "-max_muxing_queue_size", "1024",
         str(OUTPUT_FILE)
     ]
     
     print("Running FFmpeg...")
-    subprocess.run(cmd, check=True)
+    run_with_progress(cmd, final_duration)
     
     print()
     print("="*80)
@@ -103,8 +166,13 @@ def main():
     print()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compose the final demo video")
+    parser.add_argument("--encoder", default="auto", choices=["auto", *VIDEO_ENCODERS],
+                        help="Video encoder (default: auto-detect hardware encoder)")
+    args = parser.parse_args()
+    
     try:
-        main()
+        main(encoder=args.encoder)
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
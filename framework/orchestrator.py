@@ -11,22 +11,37 @@ Workflow:
 4. Phase 4: Generate Enhanced Voiceover (Monika + Emotional Expressions)
 5. Phase 5: Smart Composition (Stitch professional demo)
 
+Phases are declared as a dependency graph and each starts as soon as its inputs
+exist: AI scenes right away, recording and voiceover once the storyline is written.
+
 Usage: python3 orchestrator.py [--config Product_Specs.md]
+       python3 orchestrator.py --resume [--force-phase N]   # continue the latest run
 """
 
 import os
 import sys
 import shutil
+import atexit
 import logging
+import logging.handlers
 import argparse
-import subprocess
+import asyncio
+import functools
+import hashlib
+import json
+import mmap
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+from typing import Callable, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Resolve the phase interpreter once instead of a PATH lookup per spawn
+PYTHON = shutil.which("python3") or sys.executable
+
 # Setup Logging
 def setup_logging(log_file_path):
     """Configure logging to both file and console"""
@@ -38,6 +53,12 @@ def setup_logging(log_file_path):
     fh = logging.FileHandler(log_file_path)
     fh.setLevel(logging.DEBUG)
 
+    # Child phase output is logged line by line; batch records in memory so the
+    # file is written (and flushed) once per 1024 lines, or right away on errors
+    mh = logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=fh)
+    mh.setLevel(logging.DEBUG)
+    atexit.register(mh.flush)
+
     # Create console handler with a higher log level
     ch = logging.StreamHandler()
     ch.setLevel(logging.INFO)
@@ -48,42 +69,110 @@ def setup_logging(log_file_path):
     ch.setFormatter(formatter)
 
     # Add the handlers to the logger
-    logger.addHandler(fh)
+    logger.addHandler(mh)
     logger.addHandler(ch)
 
     return logger
 
-def run_phase(phase_num: int, phase_name: str, command: list, cwd: Path, logger: logging.Logger) -> bool:
+class PipelineState:
+    """Completed phases of a run, persisted so a resumed run can skip them"""
+
+    FILENAME = ".pipeline_state.json"
+
+    def __init__(self, output_dir: Path, force_phases=()):
+        self.path = output_dir / self.FILENAME
+        self.force_phases = set(force_phases)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.phases = json.load(f)
+        except (OSError, ValueError):
+            self.phases = {}
+
+    @staticmethod
+    def fingerprint(command: list, inputs=()) -> str:
+        """64-bit hash of a phase command and the current state of its inputs"""
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update("\0".join(command).encode())
+        for path in map(Path, inputs):
+            if path.is_file():
+                # Small text inputs (config, storyline): hash the content so copies still match
+                with open(path, 'rb') as f:
+                    digest.update(hashlib.file_digest(f, 'blake2b').digest())
+            elif path.is_dir():
+                # Media directories: name, size and mtime of every file is enough
+                for entry in sorted(p for p in path.rglob("*") if p.is_file()):
+                    st = entry.stat()
+                    digest.update(f"{entry.relative_to(path)}:{st.st_size}:{st.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
+    def is_done(self, key: str, phase_num: int, fingerprint: str, artifacts=()) -> bool:
+        """Phase ran with identical inputs and its artifacts are still on disk"""
+        entry = self.phases.get(key)
+        if phase_num in self.force_phases or not entry or entry["inputs"] != fingerprint:
+            return False
+        for artifact in map(Path, artifacts):
+            if not (artifact.is_file() or (artifact.is_dir() and any(artifact.iterdir()))):
+                return False
+        return True
+
+    def mark_done(self, key: str, fingerprint: str, artifacts=()):
+        self.phases[key] = {
+            "inputs": fingerprint,
+            "artifacts": [str(a) for a in artifacts],
+            "completed": datetime.now().isoformat(timespec='seconds')
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.phases, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+async def run_phase(phase_num: int, phase_name: str, command: list, cwd: Path, logger: logging.Logger,
+                    state: PipelineState = None, inputs=(), artifacts=()) -> bool:
     """Execute a phase and track success"""
     logger.info("="*80)
     logger.info(f"🎬 PHASE {phase_num}: {phase_name.upper()}")
     logger.info("="*80)
     logger.info(f"Command: {' '.join(command)}")
+
+    if state:
+        state_key = f"{phase_num}:{phase_name}"
+        fingerprint = state.fingerprint(command, inputs)
+        if state.is_done(state_key, phase_num, fingerprint, artifacts):
+            logger.info(f"⏭️  Phase {phase_num} up to date, skipping: {phase_name}")
+            return True
     
+    process = None
     try:
         # Run command and capture output
-        process = subprocess.Popen(
-            command,
+        process = await asyncio.create_subprocess_exec(
+            *command,
             cwd=cwd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=1 << 20  # allow long progress lines
         )
 
         # Stream output to log
-        while True:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                logger.debug(output.strip())
-                print(output.strip()) # Also print to stdout for real-time feedback
-
-        # Check for errors
-        stdout, stderr = process.communicate()
+        async def drain(stream, sink):
+            async for line in stream:
+                output = line.decode(errors='replace').strip()
+                if output:
+                    sink(output)
+
+        # Drain stderr alongside stdout so neither pipe can fill up and stall the child;
+        # INFO reaches both the log file and the console handler for real-time feedback
+        stderr_lines = []
+        await asyncio.gather(
+            drain(process.stdout, logger.info),
+            drain(process.stderr, stderr_lines.append)
+        )
+        stderr = "\n".join(stderr_lines)
+        await process.wait()
         
         if process.returncode == 0:
             logger.info(f"✅ Phase {phase_num} complete: {phase_name}")
+            if state:
+                state.mark_done(state_key, fingerprint, artifacts)
             return True
         else:
             logger.error(f"❌ Phase {phase_num} failed: {phase_name}")
@@ -94,28 +183,112 @@ def run_phase(phase_num: int, phase_name: str, command: list, cwd: Path, logger:
         logger.error(f"❌ Phase {phase_num} failed: {phase_name}")
         logger.error(f"Error: {e}")
         return False
+    finally:
+        # Draining failed (e.g. a line over the limit) or the run was cancelled: don't
+        # leave the child running with nobody reading its pipes
+        if process is not None and process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+def spec_digest(config_path: Path) -> str:
+    """128-bit blake2b of the specs file, hashed straight from a read-only mapping"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(config_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+    return digest.hexdigest()
+
+def link_or_copy(src, dst):
+    """Hardlink a file into place, copying only when linking is impossible"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Cross-device, unsupported filesystem or existing target
+        shutil.copy2(src, dst)
+    return dst
+
+def find_previous_recordings(product_dir: Path, current: Path):
+    """Latest earlier INPUT-<timestamp>/raw_recordings that holds any files"""
+    for history_dir in sorted(product_dir.glob("INPUT-*"), reverse=True):
+        recordings = history_dir / "raw_recordings"
+        if history_dir != current and recordings.is_dir() and any(recordings.iterdir()):
+            return recordings
+    return None
+
+@dataclass
+class Phase:
+    """One pipeline step and the steps whose output it consumes"""
+    key: str
+    num: int
+    name: str
+    command: list
+    label: str                      # Summary entry once complete
+    failure: str                    # Logged when the phase itself fails
+    depends_on: tuple = ()          # Keys absent from the pipeline (skipped phases) are ignored
+    inputs: tuple = ()
+    artifacts: tuple = ()
+    on_success: Optional[Callable[[], None]] = None
+
+async def run_pipeline(phases: list, cwd: Path, logger: logging.Logger, state: PipelineState = None) -> dict:
+    """Run phases as a DAG, each as soon as its dependencies succeed; returns {key: ok}"""
+    tasks = {}
+
+    async def run(phase: Phase) -> bool:
+        deps = [tasks[key] for key in phase.depends_on if key in tasks]
+        if not all(await asyncio.gather(*deps)):
+            logger.warning(f"⏭️  Phase {phase.num} not started, a dependency failed: {phase.name}")
+            return False
+        ok = await run_phase(phase.num, phase.name, phase.command, cwd, logger,
+                             state=state, inputs=phase.inputs, artifacts=phase.artifacts)
+        if not ok:
+            logger.error(phase.failure)
+        elif phase.on_success:
+            phase.on_success()
+        return ok
+
+    # Dependencies are declared earlier in the table, so their tasks already exist.
+    # Independent phases keep running after a failure; with --resume their work is kept
+    for phase in phases:
+        tasks[phase.key] = asyncio.ensure_future(run(phase))
+    results = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks, results))
 
 def get_product_name(config_path: Path):
     """Extract product name from config file or filename"""
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        # Fallback to config filename without extension
+        return config_path.stem
+    return _read_product_name(str(config_path), mtime_ns)
+
+@functools.lru_cache(maxsize=8)
+def _read_product_name(config_path: str, mtime_ns: int):
+    """Parse the product name; cached per file version (mtime_ns)"""
+    path = Path(config_path)
     try:
         # JSON Support
-        if config_path.suffix.lower() == '.json':
+        if path.suffix.lower() == '.json':
             import json
-            with open(config_path, 'r', encoding='utf-8') as f:
+            with open(path, 'r', encoding='utf-8', buffering=65536) as f:
                 data = json.load(f)
                 return data.get('product', {}).get('name', '').strip().replace(" ", "")
         
-        # Markdown Support (Legacy)
-        with open(config_path, 'r', encoding='utf-8') as f:
+        # Markdown Support (Legacy) - stop reading at the first match
+        with open(path, 'r', encoding='utf-8', buffering=65536) as f:
             for line in f:
                 if "Product Name:" in line:
                     return line.split(":", 1)[1].strip().replace(" ", "")
     except Exception:
         pass
     # Fallback to config filename without extension
-    return config_path.stem
+    return path.stem
 
-def main():
+async def main():
     """Main orchestration"""
     
     parser = argparse.ArgumentParser(
@@ -142,12 +315,25 @@ def main():
         "--credentials",
         help="Credentials in format username/password (optional)"
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the latest run of this product, skipping phases that are up to date"
+    )
+    parser.add_argument(
+        "--force-phase",
+        type=int,
+        action="append",
+        default=[],
+        metavar="N",
+        help="Re-run phase N even if it is up to date (repeatable, used with --resume)"
+    )
     
     args = parser.parse_args()
     
     # Determine absolute paths
     framework_dir = Path(__file__).parent.resolve()
-    base_dir = framework_dir.parent.resolve() # Root of the project
+    base_dir = framework_dir.parent # Root of the project (parent of a resolved path is resolved)
 
     # If config not provided, try to find it in product folders
     if not args.config and args.product_name:
@@ -160,11 +346,8 @@ def main():
     if not args.config:
         args.config = "GenericProduct/INPUT/configuration/Product_Specs.json"
         
+    # resolve() always yields an absolute path (relative configs are taken from the cwd)
     abs_config_path = Path(args.config).resolve()
-    if not abs_config_path.is_absolute():
-        abs_config_path = (framework_dir / args.config).resolve()
-    else:
-        abs_config_path = Path(args.config).resolve()
 
     # Determine Product Name
     product_name = args.product_name if args.product_name else get_product_name(abs_config_path)
@@ -175,31 +358,62 @@ def main():
     product_dir = base_dir / product_name
     # Dynamic Timestamped Output & Input History
     timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+    if args.resume:
+        previous_runs = sorted(product_dir.glob("OUTPUT-*"))
+        if previous_runs:
+            timestamp = previous_runs[-1].name.removeprefix("OUTPUT-")
     output_dir = product_dir / f"OUTPUT-{timestamp}"
     input_history_dir = product_dir / f"INPUT-{timestamp}"
     
+    # Directories known to exist; ancestors of a created dir count too, so later
+    # mkdirs below them skip the parent stat/mkdir walk
+    created_dirs = set()
+
+    def ensure(path: Path):
+        if path in created_dirs:
+            return
+        path.mkdir(parents=path.parent not in created_dirs, exist_ok=True)
+        created_dirs.add(path)
+        created_dirs.update(path.parents)
+
     # Create Timestamped Directories
-    output_dir.mkdir(parents=True, exist_ok=True)
-    input_history_dir.mkdir(parents=True, exist_ok=True)
+    ensure(output_dir)
+    ensure(input_history_dir)
 
     # Setup Input Subdirectories
     input_config_dir = input_history_dir / "configuration"
     input_recordings_dir = input_history_dir / "raw_recordings"
     input_assets_dir = input_history_dir / "assets"
 
-    input_config_dir.mkdir(parents=True, exist_ok=True)
-    input_recordings_dir.mkdir(parents=True, exist_ok=True)
-    input_assets_dir.mkdir(parents=True, exist_ok=True)
+    ensure(input_config_dir)
+    ensure(input_recordings_dir)
+    ensure(input_assets_dir)
     
     # Setup subdirectories in OUTPUT
-    (output_dir / "scripts").mkdir(exist_ok=True)
-    (output_dir / "scenes").mkdir(exist_ok=True)
-    (output_dir / "voiceover").mkdir(exist_ok=True)
-    (output_dir / "final_video").mkdir(exist_ok=True)
+    ensure(output_dir / "scripts")
+    ensure(output_dir / "scenes")
+    ensure(output_dir / "voiceover")
+    ensure(output_dir / "final_video")
     
+    # Caches that outlive a run (spec parses, browser profiles); phases inherit the location
+    cache_dir = base_dir / "OUTPUT" / ".cache"
+    ensure(cache_dir)
+    os.environ["DEMO_CACHE_DIR"] = str(cache_dir)
+    
+    # Paths shared by several phase commands, formatted once
+    storyline_path = str(output_dir / "scripts" / "Storyline.md")
+    scenes_dir = str(output_dir / "scenes")
+    voiceover_dir = str(output_dir / "voiceover")
+    recordings_dir = str(input_recordings_dir)
+    final_video = str(output_dir / "final_video" / "Final_Demo_Video.mp4")
+    archived_config = str(input_config_dir / "Product_Specs.json")
+    # Phases read the freshly generated spec when the product was analyzed
+    phase_config = archived_config if args.analyze_url else str(abs_config_path)
+
     # Archive Input Config
-    if abs_config_path.exists():
-         shutil.copy(abs_config_path, input_config_dir / "Product_Specs.json")
+    config_exists = abs_config_path.is_file()
+    if config_exists:
+         shutil.copyfile(abs_config_path, archived_config)
 
     # Setup Logging
     log_file = output_dir / f"run_{product_name}.log"
@@ -208,161 +422,156 @@ def main():
     logger.info("="*80)
     logger.info("🚀 AUTONOMOUS PRODUCT DEMO GENERATOR (PRO EDITION)")
     logger.info("="*80)
-    logger.info(f"Config: {abs_config_path}")
+    logger.info(f"Config: {abs_config_path}{'' if config_exists else ' (not found)'}")
     logger.info(f"Product: {product_name}")
     logger.info(f"Output Directory: {output_dir}")
     logger.info(f"Input Archive: {input_history_dir}")
     logger.info(f"Started: {timestamp}")
     
-    # Track phases
-    phases_completed = []
+    # Track phases (persisted per run so --resume can skip finished ones)
     start_time = datetime.now()
+    state = PipelineState(output_dir, args.force_phase)
+
+    def finalize_specs():
+        """Specs are final once analysis is done: archive them and share their digest"""
+        if args.analyze_url and abs_config_path.exists():
+            # Analysis updates the config in place (abs_config_path), so we copy it to our timestamped input
+            shutil.copyfile(abs_config_path, archived_config)
+        # Hash once and hand the digest to every phase (inherited env) so config_loader
+        # can key its parse cache without re-hashing
+        if Path(phase_config).is_file():
+            stat = os.stat(phase_config)
+            os.environ["PRODUCT_SPECS_PATH"] = phase_config
+            os.environ["PRODUCT_SPECS_SHA"] = spec_digest(Path(phase_config))
+            # The digest only holds for this version of the file; consumers compare stats
+            os.environ["PRODUCT_SPECS_STAT"] = f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    # Pipeline DAG: every phase starts as soon as the phases it depends on succeed
+    phases = []
 
     # Phase 0: Product Analysis (Optional)
     if args.analyze_url:
         analyze_cmd = [
-            "python3",
+            PYTHON,
             "product_analyzer.py",
             f"--url={args.analyze_url}",
-            f"--output={input_config_dir}/Product_Specs.json" # Output directly to timestamped folder
+            f"--output={archived_config}" # Output directly to timestamped folder
         ]
         if args.product_name:
             analyze_cmd.append(f"--name={args.product_name}")
         if args.credentials:
             analyze_cmd.append(f"--credentials={args.credentials}")
-            
-        if not run_phase(
-            0,
-            "Product Analysis & Spec Generation",
-            analyze_cmd,
-            framework_dir,
-            logger
-        ):
-            logger.error("Product Analysis failed")
-            sys.exit(1)
-        phases_completed.append("Product Analysis")
-    
-        # Re-copy the generated config to history
-        # Analysis updates the config in place (abs_config_path), so we copy it to our timestamped input
-        if abs_config_path.exists():
-             shutil.copy(abs_config_path, input_config_dir / "Product_Specs.json")
+
+        phases.append(Phase(
+            "analysis", 0, "Product Analysis & Spec Generation", analyze_cmd,
+            label="Product Analysis",
+            failure="Product Analysis failed",
+            artifacts=(archived_config,),
+            on_success=finalize_specs
+        ))
+    else:
+        finalize_specs()
 
     # Phase 1: Storyline Generation (Context-Aware)
-    if not run_phase(
-        1,
-        "Storyline Intelligence Engine",
+    phases.append(Phase(
+        "storyline", 1, "Storyline Intelligence Engine",
         [
-            "python3",
+            PYTHON,
             "storyline_generator.py",
-
-            f"--config={input_config_dir}/Product_Specs.json" if args.analyze_url else f"--config={abs_config_path}", # Use new config if analyzed
-            f"--output={output_dir}/scripts/Storyline.md"
+            f"--config={phase_config}", # Use new config if analyzed
+            f"--output={storyline_path}"
         ],
-        framework_dir,
-        logger
-    ):
-        logger.error("Pipeline failed at Phase 1 (Storyline)")
-        sys.exit(1)
-    phases_completed.append("Storyline Generation")
+        label="Storyline Generation",
+        failure="Pipeline failed at Phase 1 (Storyline)",
+        depends_on=("analysis",),
+        inputs=(phase_config,),
+        artifacts=(storyline_path,)
+    ))
 
     # Phase 2: Browser Recording & Video Generation
     if not args.skip_recording:
-        # Save recordings to the timestamped INPUT archive for this run
-        recording_output_dir = input_recordings_dir
-
-        if not run_phase(
-            2,
-            "Autonomous Video Recording",
+        phases.append(Phase(
+            "recording", 2, "Autonomous Video Recording",
             [
-                "python3",
+                PYTHON,
                 "browser_recorder.py",
-                f"--storyline={output_dir}/scripts/Storyline.md", 
-                f"--config={input_config_dir}/Product_Specs.json" if args.analyze_url else f"--config={abs_config_path}",
-                f"--output-dir={recording_output_dir}" 
+                f"--storyline={storyline_path}", 
+                f"--config={phase_config}",
+                f"--output-dir={recordings_dir}" # Timestamped INPUT archive for this run
             ],
-            framework_dir,
-            logger
-        ):
-            logger.error("Recording failed. Pipeline stopped.")
-            logger.error("Recording failed. Pipeline stopped.")
-            sys.exit(1)
-        phases_completed.append("Autonomous Video Recording")
+            label="Autonomous Video Recording",
+            failure="Recording failed. Pipeline stopped.",
+            depends_on=("storyline",),
+            inputs=(storyline_path, phase_config),
+            artifacts=(recordings_dir,)
+        ))
     else:
         logger.info("Skipping Phase 2: Browser Recording (User Request)")
-        logger.info(f"⚠️  Expecting pre-existing recordings in: {input_recordings_dir}")
-        # Logic to copy from a previous run or generic location could go here if needed
-        pass
-        
-    # Phase 3: AI Scene Generation (Hooks/B-Roll)
-    if not run_phase(
-        3,
-        "Generative Visuals Engine (Hook)",
-        [
-            "python3",
-            "skills/scene_generator/agent.py",
-            "--type=hook",
-            f"--output-dir={output_dir}/scenes"
-        ],
-        framework_dir,
-        logger
-    ):
-        logger.error("Pipeline failed at Phase 3 (Hook Scene)")
-        sys.exit(1)
-    
-    # Tech Stack Scene
-    if not run_phase(
-        3,
-        "Generative Visuals Engine (Tech Stack)",
-        [
-            "python3",
-            "skills/scene_generator/agent.py",
-            "--type=tech",
-             f"--output-dir={output_dir}/scenes"
-        ],
-        framework_dir,
-        logger
-    ):
-        logger.error("Pipeline failed at Phase 3 (Tech Stack Scene)")
-        sys.exit(1)
-    phases_completed.append("AI Scene Generation")
-        
+        previous_recordings = find_previous_recordings(product_dir, input_history_dir)
+        if previous_recordings:
+            # Recordings are never modified after capture, so hardlink them into this run's
+            # archive instead of byte-copying hundreds of MB of video
+            shutil.copytree(previous_recordings, input_recordings_dir,
+                            copy_function=link_or_copy, dirs_exist_ok=True)
+            logger.info(f"♻️  Reusing recordings from: {previous_recordings}")
+        else:
+            logger.info(f"⚠️  Expecting pre-existing recordings in: {input_recordings_dir}")
+
+    # Phase 3: AI Scene Generation (Hook + Tech Stack) needs no other phase's output
+    for scene_type, label in (("hook", "Hook"), ("tech", "Tech Stack")):
+        phases.append(Phase(
+            f"scene_{scene_type}", 3, f"Generative Visuals Engine ({label})",
+            [
+                PYTHON,
+                "skills/scene_generator/agent.py",
+                f"--type={scene_type}",
+                f"--output-dir={scenes_dir}"
+            ],
+            label=f"AI Scene Generation ({label})",
+            failure="Pipeline failed at Phase 3 (AI Scenes)",
+            artifacts=(scenes_dir,)
+        ))
+
     # Phase 4: Enhanced Voiceover Generation
-    if not run_phase(
-        4,
-        "Neural Voice Synthesis",
+    phases.append(Phase(
+        "voiceover", 4, "Neural Voice Synthesis",
         [
-            "python3",
+            PYTHON,
             "skills/voiceover_generator/agent.py",
-            f"--storyline={output_dir}/scripts/Storyline.md",
-            f"--output_dir={output_dir}/voiceover"
+            f"--storyline={storyline_path}",
+            f"--output_dir={voiceover_dir}"
         ],
-        framework_dir,
-        logger
-    ):
-        logger.error("Pipeline failed at Phase 4")
-        sys.exit(1)
-    phases_completed.append("Enhanced Voiceover")
+        label="Enhanced Voiceover",
+        failure="Pipeline failed at Phase 4",
+        depends_on=("storyline",),
+        inputs=(storyline_path,),
+        artifacts=(voiceover_dir,)
+    ))
 
     # Phase 6: Professional Video Composition
-    if not run_phase(
-        6,
-        "Professional Smart Composition",
+    phases.append(Phase(
+        "composition", 6, "Professional Smart Composition",
         [
-            "python3",
+            PYTHON,
             "smart_compositor_v2.py",
-            f"--storyline={output_dir}/scripts/Storyline.md", 
-            f"--output={output_dir}/final_video/Final_Demo_Video.mp4",
-            f"--recordings-dir={input_history_dir}/raw_recordings",
-            f"--scenes-dir={output_dir}/scenes",
-            f"--voiceover-dir={output_dir}/voiceover",
+            f"--storyline={storyline_path}", 
+            f"--output={final_video}",
+            f"--recordings-dir={recordings_dir}",
+            f"--scenes-dir={scenes_dir}",
+            f"--voiceover-dir={voiceover_dir}",
             "--captions=true"
         ],
-        framework_dir,
-        logger
-    ):
-        logger.error("Pipeline failed at Phase 6")
+        label="Video Composition",
+        failure="Pipeline failed at Phase 6",
+        depends_on=("storyline", "recording", "scene_hook", "scene_tech", "voiceover"),
+        inputs=(storyline_path, recordings_dir, scenes_dir, voiceover_dir),
+        artifacts=(final_video,)
+    ))
+
+    results = await run_pipeline(phases, framework_dir, logger, state)
+    phases_completed = [phase.label for phase in phases if results[phase.key]]
+    if not all(results.values()):
         sys.exit(1)
-    phases_completed.append("Video Composition")
     
     # Summary
     elapsed = datetime.now() - start_time
@@ -375,12 +584,12 @@ def main():
     for i, phase in enumerate(phases_completed, 1):
         logger.info(f"  {i}. {phase}")
     logger.info("📁 Generated Assets:")
-    logger.info(f"  - Storyline: {output_dir}/scripts/Storyline.md")
-    logger.info(f"  - Recordings: {input_history_dir}/raw_recordings/")
-    logger.info(f"  - AI Scenes: {output_dir}/scenes/")
-    logger.info(f"  - Voiceovers: {output_dir}/voiceover/")
-    logger.info(f"  - FINAL VIDEO: {output_dir}/final_video/Final_Demo_Video.mp4")
+    logger.info(f"  - Storyline: {storyline_path}")
+    logger.info(f"  - Recordings: {recordings_dir}/")
+    logger.info(f"  - AI Scenes: {scenes_dir}/")
+    logger.info(f"  - Voiceovers: {voiceover_dir}/")
+    logger.info(f"  - FINAL VIDEO: {final_video}")
     logger.info(f"  - LOG FILE: {log_file}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
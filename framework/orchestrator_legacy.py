@@ -14,7 +14,7 @@ from dotenv import load_dotenv
 from config_loader import load_config, print_config_summary
 from script_generator import generate_voiceover_script, validate_script_timing, print_timing_report
 from voiceover_generator import generate_voiceover
-from caption_generator import generate_captions, create_styled_ass_file
+from caption_generator import generate_captions
 from video_compositor import composite_final_video, check_ffmpeg_installed
 from recording_orchestrator import save_recording_instructions, print_recording_summary
 
@@ -46,6 +46,23 @@ class PipelineState:
 """
 
 
+def ask(question: str, env_var: str, default: str) -> str:
+    """
+    Prompt the user, unless the answer is preset or nobody can answer
+    
+    The env var wins; without a terminal on stdin (CI, batch runs) the default is
+    used instead of blocking forever on input().
+    """
+    
+    answer = os.getenv(env_var)
+    if answer is None and not sys.stdin.isatty():
+        answer = default
+    if answer is not None:
+        print(f"{question}{answer}  (non-interactive, set {env_var} to override)")
+        return answer
+    return input(question)
+
+
 def check_environment() -> dict:
     """
     Check for required API keys and tools
@@ -148,7 +165,7 @@ def run_demo_pipeline(
         
         if timing_results["TOTAL"]["status"] != "✅ OK":
             print("\n⚠️  Script timing validation failed!")
-            response = input("Continue anyway? (y/n): ")
+            response = ask("Continue anyway? (y/n): ", "DEMO_AUTO_ANSWER", "n")
             if response.lower() != 'y':
                 print("Pipeline halted. Edit script or regenerate.")
                 return None
@@ -167,8 +184,8 @@ def run_demo_pipeline(
     # Stage 4: Generate Captions
     if not skip_captions:
         print("\n📝 Stage 4: Generating captions with Gemini Speech-to-Text API...")
-        state.srt_path = generate_captions(state.voiceover_path, state.config)
-        state.ass_path = create_styled_ass_file(state.srt_path, state.config)
+        state.ass_path = "../OUTPUT/captions/captions_styled.ass"
+        state.srt_path = generate_captions(state.voiceover_path, state.config, ass_path=state.ass_path)
     else:
         state.ass_path = "../OUTPUT/captions/captions_styled.ass"
         print(f"⏭️  Stage 4: Skipping captions (using {state.ass_path})")
@@ -188,7 +205,7 @@ def run_demo_pipeline(
         print("   OR use browser_subagent for automated recording")
         print()
         
-        response = input("Have you completed the recording? Enter path (or 'skip'): ")
+        response = ask("Have you completed the recording? Enter path (or 'skip'): ", "DEMO_RECORDING_PATH", "skip")
         if response.lower() in ['skip', 'n', 'no', '']:
             print("\nPipeline halted at recording stage.")
             print("Intermediate outputs saved:")
@@ -5,20 +5,30 @@ Product Analysis Agent - Automated Product Demo Builder
 import os
 import sys
 import argparse
+import atexit
 import time
 import json
 import re
+import io
+import string
+import base64
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+from pydantic import BaseModel, TypeAdapter
 
 # Selenium imports
 try:
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
-    from webdriver_manager.chrome import ChromeDriverManager
-    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
 except ImportError:
     print("❌ Selenium not installed. Please run: pip install -r framework/requirements.txt")
     sys.exit(1)
@@ -26,6 +36,7 @@ except ImportError:
 # Gemini SDK
 try:
     import google.genai as genai
+    from google.genai import errors as genai_errors
     from dotenv import load_dotenv
 except ImportError:
     print("⚠️  Google GenAI SDK or python-dotenv not installed.")
@@ -34,119 +45,401 @@ except ImportError:
 # Load environment variables
 load_dotenv()
 
-@dataclass
+VIEWPORT_WIDTH, VIEWPORT_HEIGHT = 1920, 1080
+MAX_LAZY_LOAD_SCROLLS = 30
+LAZY_LOAD_TIMEOUT = 15  # Seconds
+TILE_SETTLE_TIMEOUT_MS = 2000
+# Trackers and ad beacons only delay the load event; nothing in the analysis uses them
+BLOCKED_URLS = ("*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                "*facebook.net*", "*hotjar.com*", "*segment.io*")
+# Without a screenshot, fonts and media are dead weight too (images are off via prefs)
+FAST_TEXT_BLOCKED_URLS = ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm")
+# Chrome cannot composite a single image taller than its max texture size
+MAX_CAPTURE_HEIGHT = 16384
+# One full-page JPEG straight from the compositor instead of stitched viewport PNGs
+_FULL_PAGE_PARAMS = {"format": "jpeg", "quality": 85, "captureBeyondViewport": True}
+# Stitching tiles: JPEG decodes through Pillow's bundled libjpeg-turbo (SIMD) much faster than PNG
+_VIEWPORT_PARAMS = {"format": "jpeg", "quality": 90}
+# Bounding box for the screenshot sent to Gemini: pixels beyond this only add vision
+# tokens, but a tall page must stay tall enough for its text to remain legible
+GEMINI_IMAGE_MAX_SIZE = (1280, 4096)
+MAX_BATCH_POLL_INTERVAL = 300  # Seconds
+BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+# Gemini analysis prompt, parsed once; the credentials placeholder is shared by both
+# places that mention them so they cannot diverge
+ANALYSIS_PROMPT = string.Template("""
+        Analyze this product website screenshot and text content to generate a comprehensive product specification for a demo video.
+        
+        Product URL: $url
+        Product Name (if known): $name
+        
+        Website Text Content:
+        $text_content
+        
+        
+        Interactive Elements Found on Page:
+        $elements
+        
+        You MUST return a JSON object with the following structure:
+        {
+            "product_name": "Name of the product",
+            "tagline": "A catchy, short tagline (max 10 words)",
+            "category": "Product Category (e.g. SaaS, DevTool, E-commerce)",
+            "problem_statement": "The core problem this product solves (max 300 chars)",
+            "solution_overview": "How the product solves it (max 300 chars)",
+            "key_features": ["Feature 1", "Feature 2", "Feature 3"],
+            "target_audience": "Who this is for",
+            "colors": {
+                "primary": "#HexCode",
+                "background": "#HexCode",
+                "accent": "#HexCode"
+            },
+            "demo_scenes": [
+                {
+                    "name": "Scene Name",
+                    "objective": "What to demonstrate",
+                    "visuals": "Description of visuals",
+                    "actions": [
+                        "Click button with text 'Login'",
+                        "Type '$creds' in input with type 'email'",
+                        "Wait 3 seconds"
+                    ]
+                }
+            ]
+        }
+        
+        IMPORTANT for "actions":
+        - Use specific text or IDs from the 'Interactive Elements' list provided above.
+        - Format actions clearly: "Click [Text]", "Type [Text] in [Element]", "Wait [Seconds]".
+        - If credentials are required, use '$creds' (first part username, second password).
+        """)
+
+# Leads a packed request (several products, one call); each product's own prompt follows
+PACKED_PROMPT = string.Template("""
+        You will analyze $count different products, each introduced by a "=== Product N ===" line
+        and followed by its own instructions, text content and screenshot. Analyze each one
+        independently. Return a JSON array with exactly $count objects, one per product, in
+        the order given.
+        """)
+
+# Steps down the page a viewport per 100ms tick so lazy loaders fire, then resolves once
+# the height has been stable for 500ms and every image is decoded; one async round trip
+# replaces a scroll + scrollHeight query per viewport and a separate image poll. It gives
+# up on its own deadline (before the WebDriver script timeout) so the timer never keeps
+# scrolling the page under the screenshot; resolves with the height and whether it settled
+_LAZY_LOAD_JS = """
+const [step, maxSteps, budgetMs, done] = arguments;
+const deadline = performance.now() + budgetMs;
+let y = 0, steps = 0, last = -1, stable = 0;
+const finish = (height, settled) => {
+    clearInterval(timer);
+    window.scrollTo(0, 0);
+    done([height, settled]);
+};
+const timer = setInterval(() => {
+    const height = document.body.scrollHeight;
+    if (performance.now() > deadline) {
+        finish(height, false);
+    } else if (y < height && steps < maxSteps) {
+        window.scrollTo(0, y);
+        y += step;
+        steps++;
+        stable = 0;
+    } else if (height === last && [...document.images].every(i => i.complete)) {
+        if (++stable >= 5) finish(height, true);
+    } else {
+        stable = 0;
+    }
+    last = height;
+}, 100);
+"""
+
+# Scrolls to a tile and resolves as soon as the images in view have loaded and a frame
+# has painted (or after the cap), instead of a fixed sleep per tile
+_SCROLL_SETTLE_JS = """
+const [y, capMs, done] = arguments;
+window.scrollTo(0, y);
+const deadline = performance.now() + capMs;
+const inView = i => { const r = i.getBoundingClientRect(); return r.bottom > 0 && r.top < innerHeight; };
+const check = () => {
+    if (performance.now() < deadline && ![...document.images].filter(inView).every(i => i.complete)) {
+        setTimeout(check, 50);
+        return;
+    }
+    requestAnimationFrame(() => requestAnimationFrame(() =>
+        done([window.scrollY, document.body.scrollHeight])));
+};
+check();
+"""
+
+# Elements offered to Gemini as action targets; matched with a single querySelectorAll
+INTERACTIVE_SELECTOR = "button, a, input, [role='button']"
+
+# Body text (sliced in-page so only the first 15k chars cross the WebDriver wire) plus
+# the first 50 visible, referenceable interactive elements, in one round trip instead of
+# ~6 WebDriver calls per element; the scan stops at the cap rather than measuring every link
+_PAGE_CONTENT_JS = """
+const [selector, maxText, maxElements] = arguments;
+const elements = [];
+for (const e of document.querySelectorAll(selector)) {
+    if (e.getClientRects().length === 0) continue;
+    const text = (e.innerText || '').trim().replace(/\\n/g, ' ').slice(0, 50);
+    // Nothing Gemini could reference (icon-only, empty): don't let it use up the cap
+    if (!text && !e.id && !e.getAttribute('aria-label')) continue;
+    elements.push({tag: e.tagName.toLowerCase(), text, id: e.id, type: e.getAttribute('type')});
+    if (elements.length >= maxElements) break;
+}
+return {text: document.body ? document.body.innerText.slice(0, maxText) : '', elements};
+"""
+
+class TokenBucket:
+    """Thread-safe token bucket: allows `rate` calls per `per` seconds, with bursts up to `rate`"""
+    
+    def __init__(self, rate: int, per: float):
+        self.capacity = rate
+        self.fill_rate = rate / per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+        
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+# Stay under the Gemini free-tier request quota proactively instead of reacting to 429s
+GEMINI_RATE_LIMIT = TokenBucket(rate=20, per=60)
+# In-flight generate_content calls; threads waiting on Gemini don't hold a browser
+MAX_GEMINI_CONCURRENCY = 10
+MAX_RETRY_DELAY = 60  # Seconds
+GEMINI_SLOTS = threading.BoundedSemaphore(MAX_GEMINI_CONCURRENCY)
+
+@dataclass(slots=True)
 class ProductData:
     url: str
     name: Optional[str]
     screenshot_path: Optional[str] = None
     text_content: Optional[str] = None
-    screenshot_path: Optional[str] = None
-    text_content: Optional[str] = None
     interactive_elements: Optional[str] = None
     analysis_result: Optional[Dict[str, Any]] = None
 
+class SpecColors(BaseModel):
+    primary: str
+    background: str
+    accent: str
+
+class SpecScene(BaseModel):
+    name: str
+    objective: str
+    visuals: str
+    actions: List[str]
+
+class SpecSchema(BaseModel):
+    """Structure Gemini must return; passed as response_schema so malformed output is
+    rejected by the API instead of silently defaulted downstream"""
+    product_name: str
+    tagline: str
+    category: str
+    problem_statement: str
+    solution_overview: str
+    key_features: List[str]
+    target_audience: str
+    colors: SpecColors
+    demo_scenes: List[SpecScene]
+
+def parse_spec(response) -> Dict[str, Any]:
+    """Validated analysis dict from a Gemini response (SDK-parsed when available)"""
+    parsed = getattr(response, "parsed", None)
+    if not isinstance(parsed, SpecSchema):
+        parsed = SpecSchema.model_validate_json(response.text)
+    return parsed.model_dump()
+
+SPEC_LIST = TypeAdapter(List[SpecSchema])
+
+def parse_specs(response) -> list:
+    """Validated analysis dicts from a packed (JSON array) Gemini response"""
+    parsed = getattr(response, "parsed", None)
+    if not isinstance(parsed, list):
+        parsed = SPEC_LIST.validate_json(response.text)
+    return [spec.model_dump() for spec in parsed]
+
+class BrowserPool:
+    """Up to `size` warm Chrome sessions, recycled between pages instead of cold-started"""
+    
+    def __init__(self, options: Options, driver_path: Optional[str], size: int = 1,
+                 grid_url: Optional[str] = None, blocked_urls: tuple = ()):
+        self.options = options
+        self.driver_path = driver_path
+        self.size = size
+        self.grid_url = grid_url
+        self.blocked_urls = list(blocked_urls)
+        self._idle = []
+        self._started = 0
+        # Guards _idle/_started; waiters are woken whenever a driver is returned or a
+        # slot frees up (discarded driver, failed start), so a crash can't strand them
+        self._cond = threading.Condition()
+        # Don't leak Chrome processes if the owner never calls close()
+        atexit.register(self.close)
+        
+    def acquire(self):
+        """Take an idle driver, starting a new one while below `size`, else wait for one"""
+        with self._cond:
+            while not self._idle and self._started >= self.size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+        try:
+            if self.grid_url:
+                return webdriver.Remote(command_executor=self.grid_url, options=self.options)
+            driver = webdriver.Chrome(service=Service(self.driver_path), options=self.options)
+        except Exception:
+            self._free_slot()
+            raise
+        if self.blocked_urls:
+            # Set once per session; the block list survives navigations
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+            except Exception as e:
+                print(f"⚠️  Could not block URLs via CDP: {e}")
+        return driver
+    
+    def release(self, driver):
+        """Reset a driver's state and return it to the pool; broken drivers are dropped"""
+        try:
+            self._clear_state(driver)
+            driver.get("about:blank")
+        except Exception:
+            self._discard(driver)
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+    
+    def _clear_state(self, driver):
+        """Drop cookies (every domain) and the visited origin's storage so the next URL
+        starts clean; the HTTP cache is kept on purpose"""
+        if not hasattr(driver, "execute_cdp_cmd"):
+            # Grid sessions: WebDriver only reaches the current origin
+            driver.delete_all_cookies()
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            return
+        origin = driver.execute_script("return location.origin")
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        if origin and origin != "null":
+            # localStorage, IndexedDB, service workers, Cache Storage, ...
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    
+    def _free_slot(self):
+        with self._cond:
+            self._started -= 1
+            self._cond.notify()
+    
+    def _discard(self, driver):
+        self._free_slot()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def close(self):
+        """Quit every idle driver"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
 class BrowserAnalyzer:
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, pool_size: int = 1, fast_text: bool = False):
+        self.fast_text = fast_text
         self.options = Options()
         if headless:
             self.options.add_argument("--headless=new")
         self.options.add_argument("--window-size=1920,1080")
         self.options.add_argument("--no-sandbox")
         self.options.add_argument("--disable-dev-shm-usage")
+        # Incognito keeps the profile off disk; per-URL isolation comes from BrowserPool.release()
+        self.options.add_argument("--incognito")
+        # Nothing the analysis needs: skip extension, sync and background traffic
+        self.options.add_argument("--disable-extensions")
+        self.options.add_argument("--disable-background-networking")
+        self.options.add_argument("--disable-sync")
+        prefs = {"profile.default_content_setting_values.notifications": 2}
+        if fast_text:
+            # Text + elements only: no screenshot, so don't fetch or decode images at all
+            prefs["profile.managed_default_content_settings.images"] = 2
+            self.options.add_argument("--blink-settings=imagesEnabled=false")
+        self.options.add_experimental_option("prefs", prefs)
+        # get() returns at DOMContentLoaded; _wait_ready() then bounds the wait for the full
+        # load instead of blocking on slow third-party resources up to the page-load timeout
+        self.options.page_load_strategy = 'eager'
+        # SELENIUM_GRID_URL runs the sessions on a remote Selenium Grid instead of local Chrome
+        grid_url = os.getenv("SELENIUM_GRID_URL")
+        # CHROMEDRIVER_PATH pins the driver; otherwise Selenium Manager (built into Selenium
+        # 4.6+) resolves it from its local cache, with no webdriver-manager version probing
+        self.driver_path = None if grid_url else os.getenv("CHROMEDRIVER_PATH")
+        blocked = BLOCKED_URLS + FAST_TEXT_BLOCKED_URLS if fast_text else BLOCKED_URLS
+        self.pool = BrowserPool(self.options, self.driver_path, size=pool_size, grid_url=grid_url,
+                                blocked_urls=blocked)
+        
+    def close(self):
+        """Shut down the pooled Chrome sessions"""
+        self.pool.close()
         
     def analyze(self, url: str, product_name: Optional[str] = None) -> ProductData:
         print(f"🔍 Analyzing: {url}")
         
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=self.options)
         product_data = ProductData(url=url, name=product_name)
+        driver = None
         
         try:
+            driver = self.pool.acquire()
+            
             # Navigate
             driver.get(url)
-            time.sleep(3)  # Wait for load
-            
-            # Screenshot
-            screenshot_dir = Path("INPUT/raw_recordings")
-            screenshot_dir.mkdir(parents=True, exist_ok=True)
-            timestamp = int(time.time())
-            screenshot_path = screenshot_dir / f"analysis_screenshot_{timestamp}.png"
+            self._wait_ready(driver, timeout=10)
             
             # Set localized window size for realistic rendering (avoiding 100vh distortion)
-            driver.set_window_size(1920, 1080)
-            
-            # 1. Scroll to bottom to trigger lazy loading
-            total_height = driver.execute_script("return document.body.scrollHeight")
-            current_scroll = 0
-            while current_scroll < total_height:
-                driver.execute_script(f"window.scrollTo(0, {current_scroll});")
-                time.sleep(0.5) # Wait for animations/load
-                current_scroll += 1080
-                total_height = driver.execute_script("return document.body.scrollHeight") # Re-check height
-            
-            # 2. Capture and stitch
-            from PIL import Image
-            import io
-            
-            driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
-            
-            total_height = driver.execute_script("return document.body.scrollHeight")
-            num_scrolls = int(total_height / 1080) + 1
-            
-            stitched_image = Image.new('RGB', (1920, total_height))
-            
-            for i in range(num_scrolls):
-                scroll_y = min(i * 1080, total_height - 1080)
-                if scroll_y < 0: scroll_y = 0
-                
-                driver.execute_script(f"window.scrollTo(0, {scroll_y});")
-                time.sleep(0.5) # Stabilize
-                
-                
-                # Capture viewport
-                png_data = driver.get_screenshot_as_png()
-                screenshot = Image.open(io.BytesIO(png_data))
-                
-                # Paste into stitched image
-                # Logic: If we are at the very bottom, we might need to crop the top of the screenshot?
-                # Simpler: Just paste at scroll_y. 
-                # Note: 'scroll_y' is where the top of the viewport is.
-                stitched_image.paste(screenshot, (0, scroll_y))
+            driver.set_window_size(VIEWPORT_WIDTH, VIEWPORT_HEIGHT)
             
-            stitched_image.save(str(screenshot_path))
-            print(f"📸 Screenshot saved: {screenshot_path}")
-            product_data.screenshot_path = str(screenshot_path)
+            # Trigger lazy loading and screenshot (skipped in fast-text mode, where
+            # images are disabled)
+            if self.fast_text:
+                self._trigger_lazy_load(driver)
+            else:
+                product_data.screenshot_path = self._save_screenshot(driver)
             
-            # Extract Text (Simple extraction for now)
-            body_text = driver.find_element(By.TAG_NAME, "body").text
-            product_data.text_content = body_text[:15000] # Limit to 15k chars
+            # Extract Text (limit to 15k chars) and the top 50 visible buttons and links
+            content = driver.execute_script(_PAGE_CONTENT_JS, INTERACTIVE_SELECTOR, 15000, 50)
+            product_data.text_content = content["text"]
             print(f"📝 Extracted {len(product_data.text_content)} chars of text")
             
-            # Extract Interactive Elements for Test Actions
+            # Interactive Elements for Test Actions
             elements_info = []
-            
-            # Buttons and Links
-            interactables = driver.find_elements(By.CSS_SELECTOR, "button, a, input, [role='button']")
-            for i, el in enumerate(interactables[:50]): # Limit to top 50 relevant elements
-                try:
-                    if not el.is_displayed(): continue
-                    tag = el.tag_name
-                    text = el.text.strip().replace("\n", " ")[:50]
-                    el_id = el.get_attribute("id")
-                    el_class = el.get_attribute("class")
-                    el_type = el.get_attribute("type")
-                    
-                    if not text and not el_id and not el.get_attribute("aria-label"):
-                        continue
-                        
-                    desc = f"<{tag}"
-                    if text: desc += f" text='{text}'"
-                    if el_id: desc += f" id='{el_id}'"
-                    if el_type: desc += f" type='{el_type}'"
-                    desc += ">"
-                    elements_info.append(desc)
-                except:
-                    continue
+            for el in content["elements"]:
+                text, el_id, el_type = el["text"], el["id"], el["type"]
+                desc = f"<{el['tag']}"
+                if text: desc += f" text='{text}'"
+                if el_id: desc += f" id='{el_id}'"
+                if el_type: desc += f" type='{el_type}'"
+                desc += ">"
+                elements_info.append(desc)
                     
             product_data.interactive_elements = "\n".join(elements_info)
             print(f"🖱️ Found {len(elements_info)} interactive elements")
@@ -154,10 +447,117 @@ class BrowserAnalyzer:
         except Exception as e:
             print(f"❌ Browser analysis failed: {e}")
         finally:
-            driver.quit()
+            if driver is not None:
+                self.pool.release(driver)
             
         return product_data
 
+    def _save_screenshot(self, driver) -> str:
+        """Capture the whole page in one shot and save it; returns the file path"""
+        screenshot_dir = Path("INPUT/raw_recordings")
+        screenshot_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = time.time_ns()  # Unique across concurrent analyses
+        screenshot_path = screenshot_dir / f"analysis_screenshot_{timestamp}.jpg"
+        
+        if hasattr(driver, "execute_cdp_cmd"):
+            self._trigger_lazy_load(driver)
+            try:
+                screenshot = self._capture_full_page(driver)
+            except Exception as e:
+                print(f"⚠️  CDP full-page capture unavailable, stitching viewports: {e}")
+                screenshot = self._capture_tiled(driver)
+        else:
+            # No CDP (e.g. a Selenium Grid session): the stitching sweep doubles as
+            # the lazy-load pass instead of scrolling the page twice
+            screenshot = self._capture_tiled(driver)
+        
+        screenshot_path.write_bytes(screenshot)
+        print(f"📸 Screenshot saved: {screenshot_path}")
+        return str(screenshot_path)
+    
+    def _wait_ready(self, driver, timeout: float = 5.0):
+        """Poll document.readyState instead of sleeping a fixed interval"""
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except TimeoutException:
+            print(f"⚠️  Page not ready after {timeout}s, continuing")
+    
+    def _trigger_lazy_load(self, driver):
+        """Scroll through the page (capped) in-page until it settles, in one round trip"""
+        # The script stops itself a second early; the WebDriver timeout is only a backstop
+        driver.set_script_timeout(LAZY_LOAD_TIMEOUT)
+        try:
+            _, settled = driver.execute_async_script(
+                _LAZY_LOAD_JS, VIEWPORT_HEIGHT, MAX_LAZY_LOAD_SCROLLS, (LAZY_LOAD_TIMEOUT - 1) * 1000
+            )
+        except TimeoutException:
+            settled = False
+            driver.execute_script("window.scrollTo(0, 0);")
+        if not settled:
+            print("⚠️  Page still loading, capturing anyway")
+    
+    def _capture_full_page(self, driver) -> bytes:
+        """Single CDP screenshot of the full layout, returned as JPEG bytes"""
+        metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+        size = metrics.get("cssContentSize") or metrics["contentSize"]
+        clip = {
+            "x": 0,
+            "y": 0,
+            "width": size["width"],
+            "height": min(size["height"], MAX_CAPTURE_HEIGHT),
+            "scale": 1
+        }
+        result = driver.execute_cdp_cmd("Page.captureScreenshot", dict(_FULL_PAGE_PARAMS, clip=clip))
+        return base64.b64decode(result["data"])
+    
+    def _capture_viewport(self, driver) -> bytes:
+        """Current viewport as a CDP JPEG, or a WebDriver PNG where CDP is unavailable"""
+        try:
+            result = driver.execute_cdp_cmd("Page.captureScreenshot", _VIEWPORT_PARAMS)
+            return base64.b64decode(result["data"])
+        except Exception:
+            return driver.get_screenshot_as_png()
+    
+    def _capture_tiled(self, driver) -> bytes:
+        """Fallback: one scroll sweep that both triggers lazy loading and stitches viewports"""
+        from PIL import Image
+        
+        driver.set_script_timeout(LAZY_LOAD_TIMEOUT)
+        total_height = driver.execute_script("return document.body.scrollHeight")
+        stitched_image = Image.new('RGB', (VIEWPORT_WIDTH, total_height))
+        filled = 0  # Rows of the canvas already composited
+        
+        # Capture on the way down; content that lazy-loads below the fold grows the
+        # page, so keep descending until the (possibly updated) bottom is composited
+        for _ in range(MAX_LAZY_LOAD_SCROLLS):
+            if filled >= total_height:
+                break
+            scroll_y, total_height = driver.execute_async_script(_SCROLL_SETTLE_JS, filled, TILE_SETTLE_TIMEOUT_MS)
+            
+            if total_height > stitched_image.height:
+                grown = Image.new('RGB', (VIEWPORT_WIDTH, total_height))
+                grown.paste(stitched_image, (0, 0))
+                stitched_image.close()
+                stitched_image = grown
+            
+            # Paste only the rows below what is already composited (the browser clamps
+            # the last scroll, so that viewport overlaps the previous one)
+            with Image.open(io.BytesIO(self._capture_viewport(driver))) as screenshot:
+                if filled - scroll_y >= screenshot.height:
+                    break  # Could not scroll any further
+                new_rows = screenshot.crop((0, filled - scroll_y, VIEWPORT_WIDTH, screenshot.height))
+                stitched_image.paste(new_rows, (0, filled))
+                filled = min(scroll_y + screenshot.height, total_height)
+        
+        if filled < stitched_image.height:
+            stitched_image = stitched_image.crop((0, 0, VIEWPORT_WIDTH, filled))
+        
+        buffer = io.BytesIO()
+        stitched_image.save(buffer, format="JPEG", quality=85)
+        return buffer.getvalue()
+
     def assess_navigability(self, product_data: ProductData) -> str:
         """Determines if the site is fully navigable or just a landing page"""
         if not product_data.interactive_elements:
@@ -181,63 +581,43 @@ class GeminiAnalyzer:
         self.client = genai.Client(api_key=api_key)
         self.model = "gemini-2.0-flash" # Using Flash for speed/multimodal
 
-    def analyze_product(self, data: ProductData) -> Dict[str, Any]:
-        print("🧠 Sending data to Gemini for analysis...")
-        
-        prompt = f"""
-        Analyze this product website screenshot and text content to generate a comprehensive product specification for a demo video.
-        
-        Product URL: {data.url}
-        Product Name (if known): {data.name if data.name else "Extract from content"}
-        
-        Website Text Content:
-        {data.text_content}
-        
-        
-        Interactive Elements Found on Page:
-        {data.interactive_elements}
+    def _screenshot_part(self, screenshot_path: str):
+        """Downscaled JPEG of the screenshot, ready to upload"""
+        from PIL import Image
         
-        You MUST return a JSON object with the following structure:
-        {{
-            "product_name": "Name of the product",
-            "tagline": "A catchy, short tagline (max 10 words)",
-            "category": "Product Category (e.g. SaaS, DevTool, E-commerce)",
-            "problem_statement": "The core problem this product solves (max 300 chars)",
-            "solution_overview": "How the product solves it (max 300 chars)",
-            "key_features": ["Feature 1", "Feature 2", "Feature 3"],
-            "target_audience": "Who this is for",
-            "colors": {{
-                "primary": "#HexCode",
-                "background": "#HexCode",
-                "accent": "#HexCode"
-            }},
-            "demo_scenes": [
-                {{
-                    "name": "Scene Name",
-                    "objective": "What to demonstrate",
-                    "visuals": "Description of visuals",
-                    "actions": [
-                        "Click button with text 'Login'",
-                        "Type '{data.analysis_result.get('credentials', 'test@test.com') if data.analysis_result else 'test@test.com'}' in input with type 'email'",
-                        "Wait 3 seconds"
-                    ]
-                }}
-            ]
-        }}
+        # open() only parses the header, so this check costs no decode
+        with Image.open(screenshot_path) as image:
+            max_width, max_height = GEMINI_IMAGE_MAX_SIZE
+            if image.format == "JPEG" and image.width <= max_width and image.height <= max_height:
+                # Already a small JPEG: upload the file as-is instead of decoding and re-encoding
+                return genai.types.Part.from_bytes(data=Path(screenshot_path).read_bytes(), mime_type="image/jpeg")
+            image.thumbnail(GEMINI_IMAGE_MAX_SIZE, Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.convert('RGB').save(buffer, format="JPEG", quality=85)
+        return genai.types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/jpeg")
+
+    def _build_contents(self, data: ProductData) -> list:
+        """Prompt text plus the screenshot, if any"""
+        creds = data.analysis_result.get('credentials', 'test@test.com') if data.analysis_result else 'test@test.com'
+        prompt = ANALYSIS_PROMPT.substitute(
+            url=data.url,
+            name=data.name if data.name else "Extract from content",
+            text_content=data.text_content,
+            elements=data.interactive_elements,
+            creds=creds
+        )
         
-        IMPORTANT for "actions":
-        - Use specific text or IDs from the 'Interactive Elements' list provided above.
-        - Format actions clearly: "Click [Text]", "Type [Text] in [Element]", "Wait [Seconds]".
-        - If credentials are required, use '{data.analysis_result.get('credentials', 'test@test.com') if data.analysis_result else 'test@test.com'}' (first part username, second password).
-        """
+        contents = [prompt]
+        if data.screenshot_path:
+            contents.append(self._screenshot_part(data.screenshot_path))
+        return contents
+
+    def analyze_product(self, data: ProductData) -> Dict[str, Any]:
+        print("🧠 Sending data to Gemini for analysis...")
         
         try:
             # Prepare contents
-            contents = [prompt]
-            if data.screenshot_path:
-                from PIL import Image
-                image = Image.open(data.screenshot_path)
-                contents.append(image)
+            contents = self._build_contents(data)
             
             # Retry loop for 429 errors
             max_retries = 3
@@ -246,27 +626,32 @@ class GeminiAnalyzer:
             response = None
             for attempt in range(max_retries):
                 try:
-                    response = self.client.models.generate_content(
-                        model=self.model,
-                        contents=contents,
-                        config={
-                            'response_mime_type': 'application/json'
-                        }
-                    )
+                    GEMINI_RATE_LIMIT.acquire()
+                    with GEMINI_SLOTS:
+                        response = self.client.models.generate_content(
+                            model=self.model,
+                            contents=contents,
+                            config={
+                                'response_mime_type': 'application/json',
+                                'response_schema': SpecSchema
+                            }
+                        )
                     break # Success
-                except Exception as e:
-                    if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e) or "quota" in str(e).lower():
-                        if attempt < max_retries - 1:
-                            print(f"⚠️  Quota exceeded (429). Retrying in {retry_delay}s...")
-                            time.sleep(retry_delay)
-                            retry_delay *= 2 # Exponential backoff
-                            continue
-                    raise e # Re-raise if not a 429 or if max retries reached
+                except genai_errors.APIError as e:
+                    # 429 / RESOURCE_EXHAUSTED; anything else, or the last attempt, propagates
+                    if e.code == 429 and attempt < max_retries - 1:
+                        # Jitter keeps concurrent analyses from retrying in lockstep
+                        delay = min(MAX_RETRY_DELAY, retry_delay) * random.uniform(0.5, 1.5)
+                        print(f"⚠️  Quota exceeded (429). Retrying in {delay:.1f}s...")
+                        time.sleep(delay)
+                        retry_delay *= 2 # Exponential backoff
+                        continue
+                    raise
             
             if not response:
                 raise Exception("Failed to get response after retries")
 
-            result = json.loads(response.text)
+            result = parse_spec(response)
             print("✅ Gemini analysis complete")
             return result
             
@@ -274,6 +659,119 @@ class GeminiAnalyzer:
             print(f"❌ Gemini analysis failed: {e}")
             return {}
 
+    def analyze_many(self, data_list: list, max_per_call: int = 5) -> list:
+        """Analyze products several per request, one JSON array back per request; a chunk
+        whose response doesn't line up falls back to one request per product"""
+        results = []
+        for start in range(0, len(data_list), max_per_call):
+            chunk = data_list[start:start + max_per_call]
+            print(f"🧠 Sending {len(chunk)} products to Gemini in one request...")
+            contents = [PACKED_PROMPT.substitute(count=len(chunk))]
+            for i, data in enumerate(chunk, 1):
+                contents.append(f"=== Product {i} ===")
+                contents.extend(self._build_contents(data))
+            
+            try:
+                GEMINI_RATE_LIMIT.acquire()
+                with GEMINI_SLOTS:
+                    response = self.client.models.generate_content(
+                        model=self.model,
+                        contents=contents,
+                        config={
+                            'response_mime_type': 'application/json',
+                            'response_schema': List[SpecSchema]
+                        }
+                    )
+                analyses = parse_specs(response)
+                if len(analyses) != len(chunk):
+                    raise ValueError(f"expected {len(chunk)} analyses, got {len(analyses)}")
+            except Exception as e:
+                print(f"⚠️  Packed analysis failed ({e}), analyzing one at a time")
+                analyses = [self.analyze_product(data) for data in chunk]
+            results.extend(analyses)
+        print("✅ Gemini analysis complete")
+        return results
+
+    def analyze_products(self, data_list: list, poll_interval: float = 10.0) -> list:
+        """Analyze several products in one Gemini Batch API job (half price, but asynchronous)"""
+        types = genai.types
+        print(f"🧠 Submitting {len(data_list)} products to the Gemini Batch API...")
+        
+        try:
+            requests = [
+                types.InlinedRequest(
+                    contents=[types.Content(role="user", parts=[
+                        part if isinstance(part, types.Part) else types.Part.from_text(text=part)
+                        for part in self._build_contents(data)
+                    ])],
+                    config=types.GenerateContentConfig(
+                        response_mime_type='application/json',
+                        response_schema=SpecSchema
+                    )
+                )
+                for data in data_list
+            ]
+            GEMINI_RATE_LIMIT.acquire()
+            job = self.client.batches.create(model=self.model, src=requests)
+            # Jobs take minutes to hours: back the polling off instead of hitting batches.get
+            # at a fixed rate for the whole wait
+            while job.state.name not in BATCH_DONE_STATES:
+                print(f"⏳ Batch job {job.state.name}, checking again in {poll_interval:.0f}s...")
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 1.5, MAX_BATCH_POLL_INTERVAL)
+                job = self.client.batches.get(name=job.name)
+            if job.state.name != "JOB_STATE_SUCCEEDED":
+                raise Exception(f"Batch job ended in {job.state.name}")
+            inlined_responses = job.dest.inlined_responses if job.dest else None
+            if not inlined_responses:
+                raise Exception("Batch job returned no inlined responses")
+        except Exception as e:
+            print(f"⚠️  Gemini batch analysis failed ({e}), analyzing one at a time")
+            return [self.analyze_product(data) for data in data_list]
+        
+        # Inlined responses come back in request order; any item the batch didn't answer
+        # usably is retried on its own
+        results = []
+        for i, data in enumerate(data_list):
+            try:
+                inlined = inlined_responses[i]
+                if inlined.error:
+                    raise Exception(inlined.error)
+                results.append(parse_spec(inlined.response))
+            except Exception as e:
+                print(f"⚠️  Batch result unusable for {data.url} ({e}), analyzing it directly")
+                results.append(self.analyze_product(data))
+        print("✅ Gemini batch analysis complete")
+        return results
+
+# Fixed sections of every generated Product_Specs.json; only read, never mutated
+DEFAULT_JUDGING_CRITERIA = {
+    "technical_execution": {
+        "weight": 0.4,
+        "strategies": ["Highlight backend logic"]
+    },
+    "potential_impact": {
+        "weight": 0.2,
+        "strategies": ["Focus on user productivity"]
+    },
+    "innovation": {
+        "weight": 0.3,
+        "strategies": ["Showcase unique AI features"]
+    },
+    "presentation": {
+        "weight": 0.1,
+        "strategies": ["Ensure smooth transitions"]
+    }
+}
+DEFAULT_VOICEOVER = {
+    "voice_id": "EaBs7G1VibMrNAuz2Na7",
+    "tone": "Confident, professional",
+    "pacing_wpm": 145,
+    "stability": 0.5,
+    "clarity": 0.75,
+    "style": 0.5
+}
+
 def update_product_specs(data: ProductData, analysis: Dict[str, Any], output_path: str):
     """Update the Product_Specs.json file with analyzed data"""
     path = Path(output_path)
@@ -295,32 +793,8 @@ def update_product_specs(data: ProductData, analysis: Dict[str, Any], output_pat
             "navigability_status": analysis.get("navigability_status", "full"),
             "scenes": []
         },
-        "judging_criteria": {
-            "technical_execution": {
-                "weight": 0.4,
-                "strategies": ["Highlight backend logic"]
-            },
-             "potential_impact": {
-                "weight": 0.2,
-                "strategies": ["Focus on user productivity"]
-            },
-            "innovation": {
-                "weight": 0.3,
-                "strategies": ["Showcase unique AI features"]
-            },
-            "presentation": {
-                "weight": 0.1,
-                "strategies": ["Ensure smooth transitions"]
-            }
-        },
-        "voiceover": {
-            "voice_id": "EaBs7G1VibMrNAuz2Na7",
-            "tone": "Confident, professional",
-            "pacing_wpm": 145,
-            "stability": 0.5,
-            "clarity": 0.75,
-            "style": 0.5
-        },
+        "judging_criteria": DEFAULT_JUDGING_CRITERIA,
+        "voiceover": DEFAULT_VOICEOVER,
         "assets": {
             "test_credentials": {}
         }
@@ -364,58 +838,100 @@ def update_product_specs(data: ProductData, analysis: Dict[str, Any], output_pat
         product_specs["demo"]["scenes"].append(new_scene)
         start_time = end_time
         
-    # Write JSON
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(product_specs, f, indent=2)
+    # Write JSON (dumps + one write: json.dump issues a write per token)
+    path.write_text(json.dumps(product_specs, indent=2), encoding='utf-8')
         
     print(f"✅ Updated {output_path}")
 
-def main():
-    parser = argparse.ArgumentParser(description="Analyze product URL and generate Product_Specs.json")
-    parser.add_argument("--url", required=True, help="Product URL to analyze")
-    parser.add_argument("--name", help="Product Name (optional)")
-    parser.add_argument("--credentials", help="Login credentials (email/password)")
-    parser.add_argument("--output", default="../INPUT/configuration/Product_Specs.json", help="Output path for Product_Specs.json")
-    
-    args = parser.parse_args()
-    
+def analyze_url(browser: BrowserAnalyzer, gemini: GeminiAnalyzer, url: str, name: Optional[str],
+                credentials: Optional[str], output_path: Path) -> bool:
+    """Browser + Gemini analysis of one URL, written to its Product_Specs.json"""
     # 1. Browser Analysis
-    browser = BrowserAnalyzer()
-    data = browser.analyze(args.url, args.name)
-    
-    # 2. Gemini Analysis
-    gemini = GeminiAnalyzer()
+    data = browser.analyze(url, name)
     
     # Assess navigability before sending to Gemini (or send it too)
     navigability = browser.assess_navigability(data)
     print(f"🧭 Navigability Status: {navigability}")
     
+    # 2. Gemini Analysis
     analysis_result = gemini.analyze_product(data)
+    return save_analysis(data, analysis_result, navigability, credentials, output_path)
+
+def save_analysis(data: ProductData, analysis_result: Dict[str, Any], navigability: str,
+                  credentials: Optional[str], output_path: Path) -> bool:
+    """Write one product's Gemini analysis to its Product_Specs.json"""
     if analysis_result:
         analysis_result["navigability_status"] = navigability
     data.analysis_result = analysis_result
     
     # 3. Update Config
-    if analysis_result:
-        # Resolve output path relative to script if needed, or use absolute
-        # If args.output starts with .., resolve it relative to __file__
-        if args.output.startswith(".."):
-            output_path = Path(__file__).parent / args.output
-        else:
-            output_path = Path(args.output)
-            
-        if args.output.startswith(".."):
-            output_path = Path(__file__).parent / args.output
-        else:
-            output_path = Path(args.output)
-            
-        # Check if credentials provided
-        if args.credentials:
-             data.analysis_result["credentials"] = args.credentials
-             
-        update_product_specs(data, analysis_result, str(output_path))
-    else:
-        print("❌ Failed to generate analysis result.")
+    if not analysis_result:
+        print(f"❌ Failed to generate analysis result for {data.url}.")
+        return False
+        
+    # Check if credentials provided
+    if credentials:
+         data.analysis_result["credentials"] = credentials
+         
+    update_product_specs(data, analysis_result, str(output_path))
+    return True
+
+def resolve_output(output: str) -> Path:
+    """Paths starting with .. are relative to this script; anything else is used as given"""
+    if output.startswith(".."):
+        return Path(__file__).parent / output
+    return Path(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze product URL and generate Product_Specs.json")
+    parser.add_argument("--url", required=True, nargs='+', help="Product URL(s) to analyze")
+    parser.add_argument("--name", help="Product Name (optional)")
+    parser.add_argument("--credentials", help="Login credentials (email/password)")
+    parser.add_argument("--output", default="../INPUT/configuration/Product_Specs.json", help="Output path for Product_Specs.json")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel browser sessions when analyzing several URLs")
+    parser.add_argument("--batch", action="store_true", help="Send all URLs to Gemini as one Batch API job (cheaper, can take minutes)")
+    parser.add_argument("--pack", type=int, default=1, help="Analyze up to this many URLs per Gemini request (fewer requests, longer prompts)")
+    parser.add_argument("--fast-text", action="store_true", help="Skip images and the screenshot; analyze page text and elements only")
+    
+    args = parser.parse_args()
+    
+    output_path = resolve_output(args.output)
+    
+    # One spec per URL: a single URL keeps the exact output path
+    urls = args.url
+    output_paths = [output_path] if len(urls) == 1 else [
+        output_path.with_name(f"{output_path.stem}_{i}_{urlparse(url).netloc.replace(':', '_')}{output_path.suffix}")
+        for i, url in enumerate(urls, 1)
+    ]
+    
+    workers = max(1, min(args.workers, len(urls)))
+    browser = BrowserAnalyzer(pool_size=workers, fast_text=args.fast_text)
+    gemini = GeminiAnalyzer()
+    
+    # WebDriver and Gemini calls block on I/O, so threads scale until browsers saturate the CPU.
+    # Extra threads beyond the browser pool let the next page load while earlier ones wait
+    # on Gemini; they block in pool.acquire() until a browser is free
+    threads = min(len(urls), workers + MAX_GEMINI_CONCURRENCY)
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            if not args.batch and args.pack <= 1:
+                list(executor.map(
+                    lambda job: analyze_url(browser, gemini, job[0], args.name, args.credentials, job[1]),
+                    zip(urls, output_paths)
+                ))
+                return
+            data_list = list(executor.map(lambda url: browser.analyze(url, args.name), urls))
+    finally:
+        browser.close()
+    
+    # Batch / packed mode: every page is scanned, now analyze them in one Gemini job or a
+    # few packed requests
+    navigability = [browser.assess_navigability(data) for data in data_list]
+    for data, status in zip(data_list, navigability):
+        print(f"🧭 Navigability Status ({data.url}): {status}")
+    analyses = gemini.analyze_products(data_list) if args.batch else gemini.analyze_many(data_list, args.pack)
+    for data, analysis_result, status, path in zip(data_list, analyses, navigability, output_paths):
+        save_analysis(data, analysis_result, status, args.credentials, path)
 
     
 if __name__ == "__main__":
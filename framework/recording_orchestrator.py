@@ -5,8 +5,9 @@ Automates browser walkthrough for screen recording using browser_subagent.
 Generates detailed task prompts from Product_Specs.md demo scenes.
 """
 
+import functools
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 from config_loader import load_config, DemoConfig, DemoScene
 
 
@@ -22,21 +23,30 @@ def generate_browser_task_for_scene(scene: DemoScene, product_url: str) -> str:
         Detailed task prompt for browser automation
     """
     
+    # DemoScene isn't hashable, so memoize on the fields the prompt is built from
+    return _scene_task(scene.name, scene.duration, scene.duration_seconds,
+                       scene.objective, tuple(scene.actions))
+
+
+@functools.lru_cache(maxsize=256)
+def _scene_task(name: str, duration: str, duration_seconds: int, objective: str,
+                actions: Tuple[str, ...]) -> str:
+    """Scene task prompt, built once per distinct scene"""
     task_lines = [
-        f"# Scene: {scene.name}",
-        f"Duration: {scene.duration} ({scene.duration_seconds} seconds)",
-        f"Objective: {scene.objective}",
+        f"# Scene: {name}",
+        f"Duration: {duration} ({duration_seconds} seconds)",
+        f"Objective: {objective}",
         "",
         "## Actions:"
     ]
     
-    for action in scene.actions:
+    for action in actions:
         task_lines.append(f"- {action}")
     
     task_lines.extend([
         "",
         "## Important:",
-        f"- Allow {scene.duration_seconds} seconds for this scene",
+        f"- Allow {duration_seconds} seconds for this scene",
         "- Move mouse slowly and deliberately",
         "- Pause 2-3 seconds after each major action to allow visibility",
         "- Ensure all UI elements are clearly visible before interacting",
@@ -110,14 +120,17 @@ def generate_full_recording_task(config: DemoConfig) -> str:
     return "\n".join(task_lines)
 
 
-def save_recording_instructions(config: DemoConfig, output_path: str = "../INPUT/raw_recordings/RECORDING_INSTRUCTIONS.md") -> str:
+def save_recording_instructions(config: DemoConfig, output_path: str = "../INPUT/raw_recordings/RECORDING_INSTRUCTIONS.md",
+                                instructions: Optional[str] = None) -> str:
     """
     Save browser recording instructions to file for manual reference
     
-    Useful if browser_subagent fails or user prefers manual recording
+    Useful if browser_subagent fails or user prefers manual recording.
+    Pass `instructions` to reuse an already generated task.
     """
     
-    instructions = generate_full_recording_task(config)
+    if instructions is None:
+        instructions = generate_full_recording_task(config)
     
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -168,11 +181,9 @@ if __name__ == "__main__":
         # Print summary
         print_recording_summary(config)
         
-        # Generate instructions
-        instructions_path = save_recording_instructions(config)
-        
-        # Generate full task
+        # Generate full task once, then save it as the instructions
         task = generate_full_recording_task(config)
+        instructions_path = save_recording_instructions(config, instructions=task)
         
         print("\n📋 BROWSER AUTOMATION TASK:")
         print("-"*70)
@@ -20,7 +20,7 @@ from typing import List, Dict
 # Add parent to path for config_loader
 sys.path.insert(0, str(Path(__file__).parent))
 from config_loader import load_config
-from caption_generator import generate_captions, create_styled_ass_file
+from caption_generator import generate_captions
 
 
 class SmartCompositor:
@@ -153,10 +153,11 @@ class SmartCompositor:
         # 2. Generate and burn captions if requested
         if burn_captions:
             try:
-                # Generate SRT
-                srt_path = generate_captions(str(audio_path), None, str(self.temp_dir / f"{audio_path.stem}.srt"))
-                # Generate ASS (Styled)
-                ass_path = create_styled_ass_file(srt_path, None, str(self.temp_dir / f"{audio_path.stem}.ass"))
+                # Generate SRT and styled ASS together
+                ass_path = str(self.temp_dir / f"{audio_path.stem}.ass")
+                generate_captions(
+                    str(audio_path), None, str(self.temp_dir / f"{audio_path.stem}.srt"), ass_path=ass_path
+                )
                 
                 # Add subtitle filter
                 # escape path for ffmpeg filter